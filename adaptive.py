@@ -0,0 +1,187 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Starting difficulty (on the ability scale) for each difficulty label
+DIFFICULTY_RATINGS = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+
+
+def difficulty_db_path(question_store_path: str) -> str:
+    """Where the learned difficulties for a question store are kept: a SQLite file beside it"""
+    return os.path.splitext(question_store_path)[0] + "_difficulty.db"
+
+
+class AbilityEstimate:
+    """A student's Elo-style ability in one section"""
+
+    __slots__ = ("rating", "attempts")
+
+    def __init__(self, rating: float = 0.0, attempts: int = 0):
+        self.rating = rating
+        self.attempts = attempts
+
+    def to_list(self) -> List:
+        return [self.rating, self.attempts]
+
+    def __repr__(self):
+        return f"AbilityEstimate(rating={self.rating:.3f}, attempts={self.attempts})"
+
+
+class AdaptiveEngine:
+    """Elo/Rasch adaptive difficulty.
+
+    The chance of a correct answer is ``1 / (1 + exp(difficulty - ability))``.
+    After each answer the student's ability and the question's difficulty
+    move in opposite directions by the prediction error, in constant time.
+    The student's step size shrinks with attempts so the estimate settles.
+    Questions are picked from the section's difficulty band whose predicted
+    success is closest to ``target_success``; a band is rated by the mean
+    learned difficulty of its answered questions (its label's starting
+    rating until one has been answered).
+
+    With a ``path`` the learned difficulties are loaded from SQLite and the
+    changes are written back every ``flush_interval`` seconds (and on
+    ``close``) as increments, so processes sharing the file (the bot and
+    the Streamlit app) add up each other's answers.
+    """
+
+    def __init__(self, target_success: float = 0.7, k_user: float = 0.6,
+                 k_user_min: float = 0.1, k_question: float = 0.05,
+                 path: Optional[str] = None, flush_interval: float = 5.0):
+        self.target_success = target_success
+        self.k_user = k_user
+        self.k_user_min = k_user_min
+        self.k_question = k_question
+        # question id -> [difficulty, attempts]
+        self._questions: Dict[int, List] = {}
+        # (section, difficulty label) -> [total learned difficulty, questions]
+        self._bands: Dict[Tuple[str, str], List] = {}
+        # question id -> [section, label, difficulty change, attempts] not yet written
+        self._pending: Dict[int, List] = {}
+        self._lock = threading.Lock()
+
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn = None
+        self._closed = threading.Event()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS question_difficulty ("
+                "question_id INTEGER PRIMARY KEY, section TEXT NOT NULL, label TEXT NOT NULL, "
+                "difficulty REAL NOT NULL, attempts INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+            for question_id, section, label, difficulty, attempts in self._conn.execute(
+                "SELECT question_id, section, label, difficulty, attempts FROM question_difficulty"
+            ):
+                self._questions[question_id] = [difficulty, attempts]
+                band = self._bands.setdefault((section, label), [0.0, 0])
+                band[0] += difficulty
+                band[1] += 1
+            self._writer = threading.Thread(target=self._run, name="difficulty-writer", daemon=True)
+            self._writer.start()
+
+    @staticmethod
+    def expected_score(ability: float, difficulty: float) -> float:
+        return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+    def question_difficulty(self, question_id: Optional[int], label: str) -> float:
+        entry = self._questions.get(question_id) if question_id is not None else None
+        return entry[0] if entry else DIFFICULTY_RATINGS.get(label, 0.0)
+
+    def band_difficulty(self, section: str, label: str) -> float:
+        """Mean learned difficulty of the section's answered questions labelled ``label``"""
+        band = self._bands.get((section, label))
+        return band[0] / band[1] if band else DIFFICULTY_RATINGS.get(label, 0.0)
+
+    def target_difficulty(self, ability: AbilityEstimate) -> float:
+        """Difficulty at which the student succeeds with ``target_success``"""
+        p = self.target_success
+        return ability.rating - math.log(p / (1.0 - p))
+
+    def choose_difficulty(self, section: str, ability: AbilityEstimate) -> str:
+        target = self.target_difficulty(ability)
+        return min(DIFFICULTY_RATINGS, key=lambda label: abs(self.band_difficulty(section, label) - target))
+
+    def update(self, section: str, ability: AbilityEstimate, question_id: Optional[int],
+               label: str, score: float):
+        """Fold one answer into the ability and question estimates"""
+        difficulty = self.question_difficulty(question_id, label)
+        error = score - self.expected_score(ability.rating, difficulty)
+
+        k = max(self.k_user_min, self.k_user / math.sqrt(1 + ability.attempts))
+        ability.rating += k * error
+        ability.attempts += 1
+
+        if question_id is not None:
+            step = self.k_question * error
+            with self._lock:
+                entry = self._questions.get(question_id)
+                if entry is None:
+                    entry = self._questions[question_id] = [difficulty, 0]
+                    band = self._bands.setdefault((section, label), [0.0, 0])
+                    band[0] += difficulty
+                    band[1] += 1
+                entry[0] -= step
+                entry[1] += 1
+                self._bands[(section, label)][0] -= step
+                if self._conn is not None:
+                    pending = self._pending.setdefault(question_id, [section, label, 0.0, 0])
+                    pending[2] -= step
+                    pending[3] += 1
+
+    def flush(self):
+        """Write the learned changes since the last flush in one transaction"""
+        with self._lock:
+            if self._conn is None or not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            # A question new to the file is inserted with its current estimate
+            rows = [
+                (question_id, section, label, self._questions[question_id][0], attempts, change, attempts)
+                for question_id, (section, label, change, attempts) in pending.items()
+            ]
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO question_difficulty VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (question_id) DO UPDATE SET "
+                        "difficulty = difficulty + ?, attempts = attempts + ?",
+                        rows
+                    )
+            except sqlite3.Error:
+                for question_id, values in pending.items():
+                    current = self._pending.setdefault(question_id, values[:2] + [0.0, 0])
+                    current[2] += values[2]
+                    current[3] += values[3]
+                raise
+
+    def close(self):
+        if self._conn is None or self._closed.is_set():
+            return
+        self._closed.set()
+        self._writer.join()
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error("Question difficulty flush failed on close: %s", e)
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.warning("Question difficulty flush failed, will retry: %s", e)
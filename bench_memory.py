@@ -0,0 +1,79 @@
+"""Memory benchmark for score histories and question objects.
+
+Usage: python bench_memory.py [attempts]
+"""
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import List
+
+from ielts_core import IELTSQuestion
+from progress import ScoreHistory
+
+SECTIONS = ["listening", "reading", "writing", "speaking"]
+
+
+@dataclass
+class DictQuestion:
+    """The previous dict-backed IELTSQuestion, for comparison"""
+    question_type: str
+    difficulty: str
+    question: str
+    options: List[str] = None
+    correct_answer: str = None
+    explanation: str = None
+    arabic_translation: str = None
+    passage: str = None
+    question_id: int = None
+
+
+def measure(build) -> int:
+    """Bytes still allocated by ``build()`` once it returns"""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def score_histories(attempts: int, users: int, history_type, scores: List[int]):
+    per_user = attempts // (users * len(SECTIONS))
+    histories = []
+    for _ in range(users):
+        session = {section: history_type() for section in SECTIONS}
+        for history in session.values():
+            history.extend(scores[:per_user])
+        histories.append(session)
+    return histories
+
+
+def questions(count: int, question_type):
+    return [
+        question_type("Multiple Choice", "medium", f"Question {i}", ["A", "B", "C", "D"], "A", question_id=i)
+        for i in range(count)
+    ]
+
+
+def main(attempts: int = 1_000_000):
+    random.seed(0)
+    scores = [random.randint(0, 1) for _ in range(attempts)]
+
+    print(f"Score history, {attempts:,} attempts")
+    for users in (1, 1000):
+        as_list = measure(lambda: score_histories(attempts, users, list, scores))
+        packed = measure(lambda: score_histories(attempts, users, ScoreHistory, scores))
+        print(f"  {users:>5} user(s): list {as_list / 1e6:8.2f} MB | ScoreHistory {packed / 1e6:8.2f} MB "
+              f"| saved {(as_list - packed) / 1e6:8.2f} MB ({as_list / packed:.1f}x)")
+
+    count = 100_000
+    as_dict = measure(lambda: questions(count, DictQuestion))
+    slotted = measure(lambda: questions(count, IELTSQuestion))
+    print(f"IELTSQuestion, {count:,} objects")
+    print(f"  dataclass {as_dict / count:6.0f} B each | __slots__ {slotted / count:6.0f} B each "
+          f"| saved {(as_dict - slotted) / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,239 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_TRANSLATION_CACHE_PATH = os.getenv(
+    "IELTS_TRANSLATION_CACHE", os.path.join("data", "translation_cache.db")
+)
+# Writes to the SQLite tier between two prunes
+PRUNE_EVERY = 256
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with an optional per-entry TTL.
+
+    With ``sliding=True`` the TTL counts from the last access rather than
+    from insertion, i.e. it becomes an idle timeout. ``on_evict(key, value)``
+    is called (outside the lock) for entries dropped for size or expiry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, sliding: bool = False,
+                 on_evict: Optional[Callable] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sliding = sliding
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        expired = None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            now = time.monotonic()
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                expired = [(key, value)]
+            else:
+                if self.sliding and self.ttl:
+                    self._data[key] = (value, now + self.ttl)
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        self._notify_evicted(expired)
+        return default
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        evicted = []
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+                self.evictions += 1
+        self._notify_evicted([(k, v) for k, (v, _) in evicted])
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from the cold end; returns how many were dropped.
+
+        Only exact for ``sliding`` caches, where entries expire in LRU order.
+        """
+        if not self.ttl:
+            return 0
+        expired = []
+        now = time.monotonic()
+        with self._lock:
+            while self._data:
+                key, (value, expires_at) = next(iter(self._data.items()))
+                if expires_at > now:
+                    break
+                del self._data[key]
+                expired.append((key, value))
+            self.expirations += len(expired)
+        self._notify_evicted(expired)
+        return len(expired)
+
+    def values(self) -> List:
+        with self._lock:
+            return [value for value, _ in self._data.values()]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _notify_evicted(self, items):
+        if self.on_evict is None or not items:
+            return
+        for key, value in items:
+            self.on_evict(key, value)
+
+
+class TranslationCache:
+    """Two-tier translation cache: an in-process LRU in front of a SQLite file.
+
+    The SQLite tier survives restarts and can be shared by several processes
+    (the Discord bot and the Streamlit app) by pointing them at the same path.
+    Pass ``path=None`` to keep the cache in memory only.
+
+    The SQLite tier is bounded too: rows older than ``max_age`` seconds are
+    not served, and every ``PRUNE_EVERY`` writes (and on open) expired rows
+    are deleted and the oldest are dropped down to ``max_rows``.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_TRANSLATION_CACHE_PATH,
+                 maxsize: int = 4096, ttl: Optional[float] = 24 * 3600,
+                 max_rows: Optional[int] = 100_000, max_age: Optional[float] = 30 * 24 * 3600):
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.path = path
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.pruned = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL, "
+                "translation TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (source, target, text))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS translations_age ON translations (created_at)")
+            self._conn.commit()
+            self.prune()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so trivially different strings share an entry"""
+        return " ".join(text.split())
+
+    def get(self, text: str, source: str = "en", target: str = "ar") -> Optional[str]:
+        key = (source, target, self.normalize(text))
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT translation FROM translations "
+                    "WHERE source = ? AND target = ? AND text = ? AND created_at >= ?",
+                    key + (self._oldest_fresh(),)
+                ).fetchone()
+            if row:
+                self.disk_hits += 1
+                self.memory.set(key, row[0])
+                return row[0]
+
+        self.misses += 1
+        return None
+
+    def set(self, text: str, translation: str, source: str = "en", target: str = "ar"):
+        key = (source, target, self.normalize(text))
+        self.memory.set(key, translation)
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                    key + (translation, time.time())
+                )
+                self._conn.commit()
+                self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self.prune()
+
+    def _oldest_fresh(self) -> float:
+        return time.time() - self.max_age if self.max_age else 0.0
+
+    def prune(self) -> int:
+        """Delete expired rows, then the oldest beyond ``max_rows``; returns rows deleted"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (self._oldest_fresh(),)
+                ).rowcount
+                if self.max_rows is not None:
+                    deleted += self._conn.execute(
+                        "DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations "
+                        "ORDER BY created_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+                    ).rowcount
+        self.pruned += deleted
+        return deleted
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "pruned": self.pruned,
+            "memory": self.memory.stats(),
+        }
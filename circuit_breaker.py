@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker around an upstream service.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected immediately with ``CircuitOpenError``. Once
+    ``recovery_timeout`` seconds have passed it lets ``half_open_max_calls``
+    probe calls through: a success closes it again, a failure re-opens it.
+    A probe that ends with neither (e.g. it was cancelled) gives its slot
+    back with ``release`` so the next call can probe instead.
+    """
+
+    def __init__(self, name: str = "upstream", failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.listeners = []
+        self.transitions = deque(maxlen=50)
+        self._unnotified = []
+
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            state = self._state
+        self._notify_listeners()
+        return state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                allowed = True
+            elif self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                allowed = True
+            else:
+                self.rejected += 1
+                allowed = False
+        self._notify_listeners()
+        return allowed
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+        self._notify_listeners()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self._state != OPEN:
+                    self._transition(OPEN)
+        self._notify_listeners()
+
+    def release(self):
+        """Return a half-open probe slot for a call that ended without an outcome"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls:
+                self._half_open_calls -= 1
+
+    def call(self, fn: Callable):
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        try:
+            result = fn()
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no verdict on the upstream
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    async def acall(self, fn: Callable[[], Awaitable]):
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        try:
+            result = await fn()
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no verdict on the upstream
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+
+    def _transition(self, new_state: str):
+        # Called with the lock held; listeners run later, in _notify_listeners
+        old_state = self._state
+        self._state = new_state
+        self._half_open_calls = 0
+        self.transitions.append((time.time(), old_state, new_state))
+        self._unnotified.append((old_state, new_state))
+        logger.warning("%s circuit %s -> %s", self.name, old_state, new_state)
+
+    def _notify_listeners(self):
+        # Called without the lock, so listeners may read the state or stats
+        if not self._unnotified:
+            return
+        with self._lock:
+            transitions, self._unnotified = self._unnotified, []
+        for old_state, new_state in transitions:
+            for listener in self.listeners:
+                listener(self.name, old_state, new_state)
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "consecutive_failures": self._consecutive_failures,
+            "transitions": list(self.transitions),
+        }
@@ -0,0 +1,150 @@
+"""Class-wide reports over every student's score history.
+
+All predictions are computed in vectorized NumPy/pandas passes over a
+single columnar table of answers rather than one ``get_band_score_prediction``
+call per student; the band rules match it exactly.
+
+Usage: python cohort_analytics.py [--db data/sessions.db] [--out reports/]
+"""
+import argparse
+import os
+import sqlite3
+import warnings
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from session_store import DEFAULT_SESSION_DB_PATH
+
+SECTIONS = ["listening", "reading", "writing", "speaking"]
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+def load_scores(path: str = DEFAULT_SESSION_DB_PATH) -> pd.DataFrame:
+    """All recorded answers as a frame with user_id, section, score and answered_at"""
+    scores = pd.DataFrame({"user_id": [], "section": [], "score": [], "created_at": []})
+    if os.path.exists(path):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            scores = pd.read_sql_query("SELECT user_id, section, score, created_at FROM scores", conn)
+        except pd.errors.DatabaseError:
+            pass  # the bot has not created the scores table yet
+        finally:
+            conn.close()
+    return pd.DataFrame({
+        "user_id": scores["user_id"].astype("int64"),
+        "section": scores["section"].astype("category"),
+        "score": scores["score"].astype(float),
+        "answered_at": pd.to_datetime(scores["created_at"], unit="s"),
+    })
+
+
+def round_half_bands(bands):
+    """Vectorized ``ielts_core.round_half_band``"""
+    return np.floor(np.asarray(bands, dtype=float) * 2 + 0.5) / 2
+
+
+def to_bands(accuracy):
+    """Vectorized ``ielts_core.to_band``: accuracy -> half-rounded band in [1, 9]"""
+    return round_half_bands(np.clip(np.asarray(accuracy, dtype=float) * 9, 1.0, 9.0))
+
+
+def predict_bands(scores: pd.DataFrame) -> pd.DataFrame:
+    """One row per student: section bands, overall band, attempts and weakest section"""
+    stats = scores.groupby(["user_id", "section"], observed=True)["score"].agg(["mean", "count"])
+    accuracy = stats["mean"].unstack().reindex(columns=SECTIONS)
+    attempts = stats["count"].unstack().reindex(columns=SECTIONS).fillna(0).astype(int)
+
+    bands = pd.DataFrame(to_bands(accuracy), index=accuracy.index, columns=SECTIONS)
+    bands[accuracy.isna()] = np.nan
+    result = bands.add_suffix("_band")
+    # Same as the single-student prediction: mean of the section bands, half-rounded
+    result["overall_band"] = round_half_bands(bands.mean(axis=1))
+    result["attempts"] = attempts.sum(axis=1)
+    result["weakest_section"] = bands.idxmin(axis=1)
+    return result
+
+
+def band_distribution(predictions: pd.DataFrame) -> pd.Series:
+    """Number of students at each predicted overall band"""
+    return predictions["overall_band"].value_counts().sort_index()
+
+
+def band_percentiles(predictions: pd.DataFrame) -> pd.DataFrame:
+    """Percentiles of the overall and per-section bands across students"""
+    columns = ["overall_band"] + [f"{section}_band" for section in SECTIONS]
+    values = predictions[columns].to_numpy(dtype=float)
+    with warnings.catch_warnings():
+        # A section nobody has practised is all NaN; its percentiles stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        table = np.nanpercentile(values, PERCENTILES, axis=0) if len(values) else np.full(
+            (len(PERCENTILES), len(columns)), np.nan)
+    return pd.DataFrame(table, index=[f"p{p}" for p in PERCENTILES], columns=columns)
+
+
+def section_breakdown(scores: pd.DataFrame, predictions: pd.DataFrame) -> pd.DataFrame:
+    """Per section: accuracy, attempts, students practising it and students weakest in it"""
+    grouped = scores.groupby("section", observed=True)
+    breakdown = pd.DataFrame({
+        "accuracy": grouped["score"].mean(),
+        "attempts": grouped["score"].size(),
+        "students": grouped["user_id"].nunique(),
+    }).reindex(SECTIONS)
+    breakdown["weakest_for"] = predictions["weakest_section"].value_counts().reindex(SECTIONS)
+    return breakdown.fillna({"attempts": 0, "students": 0, "weakest_for": 0})
+
+
+def weekly_progress(scores: pd.DataFrame) -> pd.DataFrame:
+    """Accuracy, attempts and active students per ISO week and section"""
+    week = scores["answered_at"].dt.to_period("W").dt.start_time.rename("week")
+    grouped = scores.groupby([week, scores["section"]], observed=True)
+    return pd.DataFrame({
+        "accuracy": grouped["score"].mean(),
+        "attempts": grouped["score"].size(),
+        "students": grouped["user_id"].nunique(),
+    }).reset_index()
+
+
+def cohort_report(scores: pd.DataFrame) -> Dict:
+    predictions = predict_bands(scores)
+    return {
+        "students": len(predictions),
+        "predictions": predictions,
+        "distribution": band_distribution(predictions),
+        "percentiles": band_percentiles(predictions),
+        "sections": section_breakdown(scores, predictions),
+        "weekly": weekly_progress(scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Class-wide IELTS practice report")
+    parser.add_argument("--db", default=DEFAULT_SESSION_DB_PATH, help="Session store SQLite path")
+    parser.add_argument("--out", help="Directory to write the report tables to as CSV")
+    args = parser.parse_args()
+
+    report = cohort_report(load_scores(args.db))
+    if not report["students"]:
+        print(f"No recorded answers in {args.db}")
+        return
+
+    print(f"Students: {report['students']}\n")
+    print("Predicted overall band distribution:")
+    print(report["distribution"].to_string(), "\n")
+    print("Band percentiles:")
+    print(report["percentiles"].to_string(), "\n")
+    print("Sections:")
+    print(report["sections"].to_string(), "\n")
+    print("Week over week:")
+    print(report["weekly"].to_string(index=False))
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for name in ("predictions", "distribution", "percentiles", "sections", "weekly"):
+            report[name].to_csv(os.path.join(args.out, f"{name}.csv"))
+        print(f"\nWrote report tables to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,36 +5,112 @@ import json
 import os
 from datetime import datetime
 from ielts_core import IELTSAIModel, IELTSQuestion
+from sampler import QuestionSampler
+from adaptive import AbilityEstimate
+from session_store import SessionStore
+from cache import LRUCache
+from progress import ScoreHistory, summarize
+
+class IELTSBot(commands.Bot):
+    async def close(self):
+        # Release the model's aiohttp pool before the event loop goes away
+        await ielts_model.aclose()
+        # Write out active sessions and any queued session updates
+        for session in user_sessions.values():
+            save_user_session(session)
+        session_store.close()
+        # Write out the learned question difficulties
+        ielts_model.adaptive.close()
+        await super().close()
 
 # Bot configuration
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='!ielts ', intents=intents)
+bot = IELTSBot(command_prefix='!ielts ', intents=intents)
 
 # Initialize IELTS AI Model
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 GOOGLE_TRANSLATE_API_KEY = os.getenv('GOOGLE_TRANSLATE_API_KEY') 
 ielts_model = IELTSAIModel(OPENAI_API_KEY, GOOGLE_TRANSLATE_API_KEY)
 
-# User session storage (in production, use a database)
-user_sessions = {}
+# Minimum seconds between edits of a streaming !ielts generate embed
+STREAM_EDIT_INTERVAL = 1.0
+
+# Keep AI questions pre-generated so !ielts generate answers instantly (0 disables)
+QUESTION_POOL_DEPTH = int(os.getenv('IELTS_QUESTION_POOL_DEPTH', '0'))
+if QUESTION_POOL_DEPTH:
+    ielts_model.enable_question_pool(target_depth=QUESTION_POOL_DEPTH)
+
+# User sessions, persisted with write-behind so commands never wait on disk.
+# Only recently active users stay in memory; idle or least recently used
+# sessions are written out and reloaded from the store on their next command.
+SESSION_CACHE_SIZE = int(os.getenv('IELTS_SESSION_CACHE_SIZE', '10000'))
+SESSION_IDLE_TTL = float(os.getenv('IELTS_SESSION_IDLE_TTL', '3600'))
+session_store = SessionStore()
+user_sessions = LRUCache(
+    maxsize=SESSION_CACHE_SIZE, ttl=SESSION_IDLE_TTL, sliding=True,
+    on_evict=lambda user_id, session: save_user_session(session)
+)
 
 class UserSession:
+    __slots__ = ("user_id", "current_question", "score_history", "practice_mode",
+                 "language", "sampler", "ability")
+    
     def __init__(self, user_id):
         self.user_id = user_id
         self.current_question = None
-        self.score_history = {"listening": [], "reading": [], "writing": [], "speaking": []}
+        self.score_history = {section: ScoreHistory() for section in ["listening", "reading", "writing", "speaking"]}
         self.practice_mode = None
         self.language = "english"  # or "arabic"
+        self.sampler = QuestionSampler()  # avoids repeating questions
+        self.ability = {section: AbilityEstimate() for section in self.score_history}
+    
+    def to_state(self):
+        """JSON-friendly fields saved alongside the score history"""
+        return {
+            "sampler": self.sampler.to_list(),
+            "ability": {section: estimate.to_list() for section, estimate in self.ability.items()},
+        }
+    
+    @classmethod
+    def from_saved(cls, user_id, saved):
+        session = cls(user_id)
+        session.language = saved["language"] or session.language
+        session.practice_mode = saved["practice_mode"]
+        for section, scores in saved["score_history"].items():
+            session.score_history.setdefault(section, ScoreHistory()).extend(scores)
+        state = saved["state"]
+        session.sampler = QuestionSampler.from_list(state.get("sampler", []))
+        for section, values in state.get("ability", {}).items():
+            session.ability[section] = AbilityEstimate(*values)
+        return session
 
 @bot.event
 async def on_ready():
     print(f'{bot.user} has landed in Oman! Ready to help with IELTS preparation! 🇴🇲')
+    # Warm the translation cache with the PYQ texts
+    await ielts_model.apreload_pyq_translations()
 
-def get_user_session(user_id):
-    if user_id not in user_sessions:
-        user_sessions[user_id] = UserSession(user_id)
-    return user_sessions[user_id]
+async def get_user_session(user_id):
+    user_sessions.purge_expired()
+    session = user_sessions.get(user_id)
+    if session is None:
+        # Cache miss: read the store off the event loop
+        saved = await asyncio.to_thread(session_store.load, user_id)
+        # Another command for this user may have loaded it meanwhile
+        session = user_sessions.get(user_id)
+        if session is None:
+            session = UserSession.from_saved(user_id, saved) if saved else UserSession(user_id)
+            user_sessions.set(user_id, session)
+    return session
+
+def session_cache_stats():
+    """Sizing metrics for the active-session cache and its backing store"""
+    return {"cache": user_sessions.stats(), "store": session_store.stats()}
+
+def save_user_session(session):
+    """Queue the session's settings, sampler and ability for persistence"""
+    session_store.save(session.user_id, session.language, session.practice_mode, session.to_state())
 
 @bot.command(name='help')
 async def help_command(ctx):
@@ -49,7 +125,7 @@ async def help_command(ctx):
         name="📚 Practice Commands / أوامر التدريب",
         value="""
         `!ielts practice <section>` - Start practice session
-        `!ielts pyq <section>` - Get previous year questions
+        `!ielts pyq <section> [difficulty]` - Get previous year questions
         `!ielts generate <section> <type> <difficulty>` - Generate new question
         
         Sections: listening, reading, writing, speaking
@@ -91,12 +167,16 @@ async def practice_session(ctx, section: str = None):
         await ctx.send("Invalid section. Choose from: listening, reading, writing, speaking")
         return
     
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     session.practice_mode = section.lower()
     
-    # Get a question
-    question = ielts_model.get_pyq_question(section.lower())
+    # Get a question matched to the student's level
+    question = await ielts_model.aget_adaptive_question(
+        section.lower(), session.ability[section.lower()],
+        sampler=session.sampler, translate=session.language == "arabic"
+    )
     session.current_question = question
+    save_user_session(session)
     
     embed = discord.Embed(
         title=f"📝 {section.title()} Practice",
@@ -120,7 +200,7 @@ async def practice_session(ctx, section: str = None):
 @bot.command(name='answer')
 async def submit_answer(ctx, *, user_answer: str):
     """Submit an answer to the current question"""
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     
     if not session.current_question:
         await ctx.send("No active question. Start a practice session first with `!ielts practice <section>`")
@@ -129,9 +209,14 @@ async def submit_answer(ctx, *, user_answer: str):
     # Evaluate the answer
     feedback = ielts_model.evaluate_answer(session.current_question, user_answer)
     
-    # Update score history
+    # Update score history and ability estimate
     if session.practice_mode:
         session.score_history[session.practice_mode].append(feedback["score"])
+        ielts_model.update_ability(
+            session.practice_mode, session.ability[session.practice_mode], session.current_question, feedback["score"]
+        )
+        session_store.record_score(session.user_id, session.practice_mode, feedback["score"])
+        save_user_session(session)
     
     # Create feedback embed
     color = 0x00ff00 if feedback["is_correct"] else 0xff0000
@@ -154,17 +239,21 @@ async def submit_answer(ctx, *, user_answer: str):
     session.current_question = None
 
 @bot.command(name='pyq')
-async def previous_year_question(ctx, section: str = None):
+async def previous_year_question(ctx, section: str = None, difficulty: str = None):
     """Get a previous year question"""
     if not section:
         sections = ", ".join(ielts_model.syllabus.keys())
         await ctx.send(f"Please specify a section: {sections}")
         return
     
-    question = ielts_model.get_pyq_question(section.lower())
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
+    question = await ielts_model.aget_pyq_question(
+        section.lower(), translate=session.language == "arabic",
+        difficulty=difficulty.lower() if difficulty else None, sampler=session.sampler
+    )
     session.current_question = question
     session.practice_mode = section.lower()
+    save_user_session(session)
     
     embed = discord.Embed(
         title=f"📚 {section.title()} - Previous Year Question",
@@ -182,6 +271,28 @@ async def previous_year_question(ctx, section: str = None):
     
     await ctx.send(embed=embed)
 
+def generated_question_embed(section, question, language, complete=True):
+    """Embed for an AI question; ``complete=False`` marks one that is still streaming in"""
+    embed = discord.Embed(
+        title=f"🤖 AI Generated {section.title()} Question",
+        description=f"**Type:** {question.question_type} | **Level:** {question.difficulty}",
+        color=0xe74c3c
+    )
+    
+    embed.add_field(name="Question", value=question.question, inline=False)
+    
+    if language == "arabic" and question.arabic_translation:
+        embed.add_field(name="الترجمة", value=question.arabic_translation, inline=False)
+    
+    options_text = "\n".join(option for option in question.options or [] if option)
+    if options_text:
+        embed.add_field(name="Options", value=options_text, inline=False)
+    
+    if not complete:
+        embed.set_footer(text="✍️ Generating...")
+    
+    return embed
+
 @bot.command(name='generate')
 async def generate_question(ctx, section: str = None, question_type: str = None, difficulty: str = "medium"):
     """Generate a new AI question"""
@@ -190,26 +301,34 @@ async def generate_question(ctx, section: str = None, question_type: str = None,
         return
     
     try:
-        question = ielts_model.generate_question_with_ai(section, question_type or "general", difficulty)
-        session = get_user_session(ctx.author.id)
-        session.current_question = question
-        session.practice_mode = section.lower()
+        session = await get_user_session(ctx.author.id)
         
-        embed = discord.Embed(
-            title=f"🤖 AI Generated {section.title()} Question",
-            description=f"**Type:** {question.question_type} | **Level:** {question.difficulty}",
-            color=0xe74c3c
-        )
-        
-        embed.add_field(name="Question", value=question.question, inline=False)
+        # Show the question as soon as its text starts arriving and edit it in
+        # place as the rest streams in, throttled to stay under edit rate limits
+        message = None
+        last_edit = 0.0
+        question = None
+        async for question in ielts_model.astream_question_with_ai(
+            section, question_type or "general", difficulty, translate=session.language == "arabic"
+        ):
+            now = asyncio.get_running_loop().time()
+            if message is None:
+                message = await ctx.send(embed=generated_question_embed(section, question, session.language, False))
+            elif now - last_edit >= STREAM_EDIT_INTERVAL:
+                await message.edit(embed=generated_question_embed(section, question, session.language, False))
+            else:
+                continue
+            last_edit = now
         
-        if session.language == "arabic" and question.arabic_translation:
-            embed.add_field(name="الترجمة", value=question.arabic_translation, inline=False)
-        
-        if question.options:
-            embed.add_field(name="Options", value="\n".join(question.options), inline=False)
+        session.current_question = question
+        session.practice_mode = section.lower()
+        save_user_session(session)
         
-        await ctx.send(embed=embed)
+        embed = generated_question_embed(section, question, session.language)
+        if message is None:
+            await ctx.send(embed=embed)
+        else:
+            await message.edit(embed=embed)
         
     except Exception as e:
         await ctx.send(f"Error generating question: {str(e)}")
@@ -217,7 +336,7 @@ async def generate_question(ctx, section: str = None, question_type: str = None,
 @bot.command(name='score')
 async def view_scores(ctx):
     """View practice scores"""
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     
     embed = discord.Embed(
         title="📊 Your IELTS Practice Scores",
@@ -226,7 +345,7 @@ async def view_scores(ctx):
     
     for section, scores in session.score_history.items():
         if scores:
-            avg_score = sum(scores) / len(scores)
+            avg_score = scores.mean()
             recent_scores = scores[-5:]  # Last 5 scores
             embed.add_field(
                 name=f"{section.title()}",
@@ -245,7 +364,7 @@ async def view_scores(ctx):
 @bot.command(name='predict')
 async def predict_band(ctx):
     """Predict IELTS band score"""
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     
     # Convert scores to percentage for prediction
     practice_scores = {}
@@ -266,7 +385,8 @@ async def predict_band(ctx):
     )
     
     for section, score in prediction['section_scores'].items():
-        embed.add_field(name=section.title(), value=f"Band {score}", inline=True)
+        recent = prediction['recent_section_scores'][section]
+        embed.add_field(name=section.title(), value=f"Band {score}\nRecent: {recent}", inline=True)
     
     if prediction['improvement_areas']:
         embed.add_field(
@@ -287,16 +407,14 @@ async def predict_band(ctx):
 @bot.command(name='plan')
 async def study_plan(ctx, target_band: float = 7.0, weeks: int = 8):
     """Generate a study plan"""
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     
     # Determine current level based on practice scores
-    total_scores = []
-    for scores in session.score_history.values():
-        total_scores.extend(scores)
+    summary = summarize(session.score_history)
     
     current_level = "intermediate"
-    if total_scores:
-        avg = sum(total_scores) / len(total_scores)
+    if summary["total_questions"]:
+        avg = summary["accuracy"]
         if avg < 0.5:
             current_level = "beginner"
         elif avg > 0.75:
@@ -351,7 +469,7 @@ async def vocabulary_builder(ctx, level: str = "intermediate"):
 @bot.command(name='translate')
 async def translate_text(ctx, *, text: str):
     """Translate English text to Arabic"""
-    translation = ielts_model.translate_to_arabic(text)
+    translation = await ielts_model.atranslate_to_arabic(text)
     
     embed = discord.Embed(title="🔄 Translation", color=0x34495e)
     embed.add_field(name="English", value=text, inline=False)
@@ -366,8 +484,9 @@ async def set_language(ctx, lang: str = None):
         await ctx.send("Usage: `!ielts language <english/arabic>`")
         return
     
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     session.language = lang.lower()
+    save_user_session(session)
     
     if lang.lower() == 'arabic':
         await ctx.send("تم تغيير اللغة إلى العربية! ✅")
@@ -377,15 +496,19 @@ async def set_language(ctx, lang: str = None):
 @bot.command(name='skip')
 async def skip_question(ctx):
     """Skip current question and get a new one"""
-    session = get_user_session(ctx.author.id)
+    session = await get_user_session(ctx.author.id)
     
     if not session.practice_mode:
         await ctx.send("No active practice session. Use `!ielts practice <section>` to start.")
         return
     
     # Get new question
-    question = ielts_model.get_pyq_question(session.practice_mode)
+    question = await ielts_model.aget_adaptive_question(
+        session.practice_mode, session.ability.setdefault(session.practice_mode, AbilityEstimate()),
+        sampler=session.sampler
+    )
     session.current_question = question
+    save_user_session(session)
     
     embed = discord.Embed(
         title=f"⏭️ New {session.practice_mode.title()} Question",
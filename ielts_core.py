@@ -1,27 +1,133 @@
 import openai
+import aiohttp
+import asyncio
 import random
 import json
+import math
+import os
+import time
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 import requests
-from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from cache import TranslationCache
+from question_pool import QuestionPool
+from singleflight import AsyncSingleFlight, SingleFlight
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from question_bank import QuestionStore, default_question_store
+from sampler import QuestionSampler
+from adaptive import AbilityEstimate, AdaptiveEngine, difficulty_db_path
+from progress import ScoreHistory
+from partial_json import parse_partial_json
+
+GOOGLE_TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+# The v2 endpoint accepts at most 128 ``q`` segments per request
+TRANSLATE_BATCH_SIZE = 128
+
+DIFFICULTY_LEVELS = ["easy", "medium", "hard"]
+
+# Banks with more questions than this are not preloaded into the translation
+# cache at startup; their questions are translated on first use instead
+PRELOAD_MAX_QUESTIONS = int(os.getenv("IELTS_PRELOAD_MAX_QUESTIONS", "500"))
+
+# Status codes worth retrying: rate limiting and transient upstream errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Fallback translations for common phrases when no Google API key is set
+COMMON_TRANSLATIONS = {
+    "Multiple Choice": "اختيار متعدد",
+    "True/False/Not Given": "صحيح/خطأ/غير مذكور", 
+    "Reading": "القراءة",
+    "Writing": "الكتابة",
+    "Listening": "الاستماع",
+    "Speaking": "المحادثة",
+    "Question": "السؤال",
+    "Answer": "الإجابة",
+    "Difficulty": "المستوى",
+    "Easy": "سهل",
+    "Medium": "متوسط", 
+    "Hard": "صعب"
+}
+
+def round_half_band(band: float) -> float:
+    """Round to the nearest half band, as IELTS reports scores"""
+    return math.floor(band * 2 + 0.5) / 2
+
+def to_band(accuracy: float) -> float:
+    """Map a practice accuracy in [0, 1] to a half-rounded band between 1 and 9"""
+    return round_half_band(min(9.0, max(1.0, accuracy * 9)))
 
-@dataclass
 class IELTSQuestion:
-    question_type: str
-    difficulty: str
-    question: str
-    options: List[str] = None
-    correct_answer: str = None
-    explanation: str = None
-    arabic_translation: str = None
+    # Hand-written rather than a dataclass so it can use __slots__ on Python 3.9
+    __slots__ = ("question_type", "difficulty", "question", "options", "correct_answer",
+                 "explanation", "arabic_translation", "passage", "question_id")
+
+    def __init__(self, question_type: str, difficulty: str, question: str,
+                 options: List[str] = None, correct_answer: str = None, explanation: str = None,
+                 arabic_translation: str = None, passage: str = None, question_id: int = None):
+        self.question_type = question_type
+        self.difficulty = difficulty
+        self.question = question
+        self.options = options
+        self.correct_answer = correct_answer
+        self.explanation = explanation
+        self.arabic_translation = arabic_translation
+        self.passage = passage
+        self.question_id = question_id
+
+    def _fields(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"IELTSQuestion({fields})"
 
 class IELTSAIModel:
-    def __init__(self, openai_api_key: str, google_translate_api_key: str = None):
+    def __init__(self, openai_api_key: str, google_translate_api_key: str = None,
+                 translation_cache: TranslationCache = None,
+                 translate_url: str = GOOGLE_TRANSLATE_URL,
+                 http_pool_size: int = 10, connect_timeout: float = 3.05,
+                 read_timeout: float = 15.0, max_retries: int = 2,
+                 backoff_factor: float = 0.5, generation_temperature: float = 0.7,
+                 openai_breaker: CircuitBreaker = None, question_store: QuestionStore = None,
+                 adaptive_engine: AdaptiveEngine = None):
         self.openai_api_key = openai_api_key
         self.google_translate_api_key = google_translate_api_key
         openai.api_key = openai_api_key
         
+        # Shared keep-alive HTTP pool for every outbound call
+        self.timeout = (connect_timeout, read_timeout)
+        self.http_pool_size = http_pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=http_pool_size, pool_maxsize=http_pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        openai.requestssession = self.http
+        # Created on first use by the async methods, which need a running loop
+        self._aiohttp_session = None
+        # Optional pre-generated AI questions, see enable_question_pool()
+        self.question_pool = None
+        
+        # Identical concurrent upstream calls share one request. Generation is
+        # only coalesced when it is deterministic (temperature 0).
+        self.generation_temperature = generation_temperature
+        self.singleflight = SingleFlight()
+        self.async_singleflight = AsyncSingleFlight()
+        
+        # While OpenAI keeps failing, generation goes straight to the PYQ fallback
+        self.openai_breaker = openai_breaker or CircuitBreaker("openai")
+        
+        self.translation_cache = translation_cache or TranslationCache()
+        # Overridable so a local stand-in can replace the Google endpoint
+        self.translate_url = translate_url
+        
         # IELTS Syllabus Structure
         self.syllabus = {
             "listening": {
@@ -50,100 +156,421 @@ class IELTSAIModel:
             }
         }
         
-        # Previous Year Questions Database
-        self.pyq_database = {
-            "listening": [
-                {
-                    "type": "Multiple Choice",
-                    "question": "What time does the library close on weekends?",
-                    "options": ["A) 6:00 PM", "B) 8:00 PM", "C) 9:00 PM", "D) 10:00 PM"],
-                    "answer": "B",
-                    "difficulty": "easy"
-                },
-                {
-                    "type": "Form Completion",
-                    "question": "Complete the form with the missing information about the student accommodation.",
-                    "answer": "shared kitchen",
-                    "difficulty": "medium"
-                }
-            ],
-            "reading": [
-                {
-                    "type": "True/False/Not Given",
-                    "question": "The research shows that climate change affects bird migration patterns.",
-                    "answer": "True",
-                    "difficulty": "medium",
-                    "passage": "Recent studies have demonstrated significant impacts of climate change on avian migration routes..."
-                }
-            ],
-            "writing": [
-                {
-                    "type": "Task 1",
-                    "question": "The chart shows the percentage of households with different types of internet connections in three countries. Summarize the information.",
-                    "difficulty": "medium"
-                },
-                {
-                    "type": "Task 2", 
-                    "question": "Some people think that universities should accept equal numbers of male and female students in every subject. To what extent do you agree or disagree?",
-                    "difficulty": "hard"
-                }
-            ],
-            "speaking": [
-                {
-                    "type": "Part 1",
-                    "question": "Do you prefer to study in the morning or evening? Why?",
-                    "difficulty": "easy"
-                },
-                {
-                    "type": "Part 2",
-                    "question": "Describe a memorable journey you have taken. You should say: where you went, who you went with, what you did there, and explain why it was memorable.",
-                    "difficulty": "medium"
-                }
-            ]
-        }
+        # Previous Year Questions, served from a pluggable store (SQLite by default)
+        if question_store is None:
+            question_store = default_question_store()
+        self.question_store = question_store
+        self._pyq_preloaded = False
+        # Per-question difficulty estimates for adaptive selection, kept beside the store
+        if adaptive_engine is None:
+            store_path = getattr(question_store, "path", None)
+            adaptive_engine = AdaptiveEngine(path=difficulty_db_path(store_path) if store_path else None)
+        self.adaptive = adaptive_engine
 
     def translate_to_arabic(self, text: str) -> str:
         """Translate English text to Arabic using Google Translate API"""
+        return self.translate_many([text])[0]
+
+    async def atranslate_to_arabic(self, text: str) -> str:
+        """Async version of ``translate_to_arabic``"""
+        return (await self.atranslate_many([text]))[0]
+
+    def translate_many(self, texts: List[str]) -> List[str]:
+        """Translate several strings with as few API requests as possible.
+
+        Duplicates and cached strings are skipped; the rest are sent as
+        repeated ``q`` parameters in chunks of ``TRANSLATE_BATCH_SIZE``.
+        Results are returned in input order.
+        """
         if not self.google_translate_api_key:
             # Fallback translations for common phrases
-            common_translations = {
-                "Multiple Choice": "اختيار متعدد",
-                "True/False/Not Given": "صحيح/خطأ/غير مذكور", 
-                "Reading": "القراءة",
-                "Writing": "الكتابة",
-                "Listening": "الاستماع",
-                "Speaking": "المحادثة",
-                "Question": "السؤال",
-                "Answer": "الإجابة",
-                "Difficulty": "المستوى",
-                "Easy": "سهل",
-                "Medium": "متوسط", 
-                "Hard": "صعب"
-            }
-            return common_translations.get(text, f"[Arabic: {text}]")
+            return [COMMON_TRANSLATIONS.get(text, f"[Arabic: {text}]") for text in texts]
+        
+        results, pending = self._lookup_cached_translations(texts)
+        for start in range(0, len(pending), TRANSLATE_BATCH_SIZE):
+            chunk = pending[start:start + TRANSLATE_BATCH_SIZE]
+            try:
+                result = self.singleflight.do(
+                    self._translation_key(chunk),
+                    lambda: self._post(self.translate_url, data=self._translation_params(chunk)).json()
+                )
+            except Exception as e:
+                result = None
+            self._store_translations(chunk, result, results)
+        
+        return [results[text] for text in texts]
+
+    async def atranslate_many(self, texts: List[str]) -> List[str]:
+        """Async version of ``translate_many``"""
+        if not self.google_translate_api_key:
+            return [COMMON_TRANSLATIONS.get(text, f"[Arabic: {text}]") for text in texts]
+        
+        results, pending = self._lookup_cached_translations(texts)
+        chunks = [pending[start:start + TRANSLATE_BATCH_SIZE]
+                  for start in range(0, len(pending), TRANSLATE_BATCH_SIZE)]
+        responses = await asyncio.gather(
+            *(self.async_singleflight.do(
+                self._translation_key(chunk),
+                lambda chunk=chunk: self._apost_json(self.translate_url, data=self._translation_params(chunk))
+            ) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, result in zip(chunks, responses):
+            self._store_translations(chunk, None if isinstance(result, Exception) else result, results)
         
+        return [results[text] for text in texts]
+
+    def _lookup_cached_translations(self, texts: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """Split de-duplicated texts into cached results and ones still to fetch"""
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            cached = self.translation_cache.get(text)
+            if cached is not None:
+                results[text] = cached
+            else:
+                pending.append(text)
+        return results, pending
+
+    @staticmethod
+    def _translation_key(chunk: List[str]) -> Tuple:
+        return ("translate",) + tuple(TranslationCache.normalize(text) for text in chunk)
+
+    def _translation_params(self, chunk: List[str]) -> List[Tuple[str, str]]:
+        params = [('key', self.google_translate_api_key), ('source', 'en'), ('target', 'ar')]
+        params.extend(('q', text) for text in chunk)
+        return params
+
+    def _store_translations(self, chunk: List[str], result: Dict, results: Dict[str, str]):
         try:
-            url = "https://translation.googleapis.com/language/translate/v2"
-            params = {
-                'key': self.google_translate_api_key,
-                'q': text,
-                'source': 'en',
-                'target': 'ar'
-            }
-            response = requests.post(url, data=params)
-            result = response.json()
-            return result['data']['translations'][0]['translatedText']
+            translations = [t['translatedText'] for t in result['data']['translations']]
         except Exception as e:
-            return f"[Translation Error: {text}]"
+            for text in chunk:
+                results[text] = f"[Translation Error: {text}]"
+            return
+        
+        for text, translation in zip(chunk, translations):
+            # Only successful translations are cached so errors are retried later
+            self.translation_cache.set(text, translation)
+            results[text] = translation
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry attempt"""
+        return random.uniform(0, self.backoff_factor * (2 ** attempt))
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the pooled session with timeouts and bounded retry"""
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self.http.post(url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    response.raise_for_status()
+                    return response
+            time.sleep(self._backoff_delay(attempt))
+
+    async def _get_aiohttp_session(self) -> aiohttp.ClientSession:
+        """Create the pooled aiohttp session lazily, inside the running loop"""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            self._aiohttp_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.http_pool_size),
+                timeout=aiohttp.ClientTimeout(connect=self.timeout[0], sock_read=self.timeout[1])
+            )
+        return self._aiohttp_session
+
+    async def _apost_json(self, url: str, **kwargs) -> Dict:
+        """Async ``_post`` that returns the decoded JSON body"""
+        session = await self._get_aiohttp_session()
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                async with session.post(url, **kwargs) as response:
+                    if response.status not in RETRY_STATUS_CODES or last_attempt:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+            await asyncio.sleep(self._backoff_delay(attempt))
 
-    def generate_question_with_ai(self, section: str, question_type: str, difficulty: str) -> IELTSQuestion:
-        """Generate new questions using OpenAI API based on PYQ patterns"""
+    def close(self):
+        """Release pooled connections, the caches and stores; flush learned difficulties"""
+        self.http.close()
+        self.translation_cache.close()
+        self.question_store.close()
+        self.adaptive.close()
+
+    async def aclose(self):
+        """Close the aiohttp session used by the async methods"""
+        if self._aiohttp_session is not None:
+            await self._aiohttp_session.close()
+            self._aiohttp_session = None
+
+    def preload_pyq_translations(self) -> int:
+        """Warm the translation cache with the PYQ question texts.
+
+        Runs once per model, and not at all for banks larger than
+        ``PRELOAD_MAX_QUESTIONS``. Returns the number of texts preloaded.
+        """
+        texts = self._pyq_texts_to_preload()
+        self.translate_many(texts)
+        return len(texts)
+
+    async def apreload_pyq_translations(self) -> int:
+        """Async version of ``preload_pyq_translations``"""
+        texts = await asyncio.to_thread(self._pyq_texts_to_preload)
+        await self.atranslate_many(texts)
+        return len(texts)
+
+    def _pyq_texts_to_preload(self) -> List[str]:
+        if self._pyq_preloaded or len(self.question_store) > PRELOAD_MAX_QUESTIONS:
+            return []
+        self._pyq_preloaded = True
+        return list(self.question_store.iter_question_texts())
+
+    def syllabus_question_types(self, section: str) -> List[str]:
+        """Question types for a section, whatever key the syllabus uses for them"""
+        details = self.syllabus.get(section, {})
+        if "question_types" in details:
+            return details["question_types"]
+        if "task1_types" in details:
+            return details["task1_types"] + details["task2_types"]
+        return details.get("sections", [])
+
+    def enable_question_pool(self, target_depth: int = 3, low_water: int = 1,
+                             workers: int = 2) -> QuestionPool:
+        """Start background workers that keep AI questions ready for every
+        syllabus (section, type, difficulty) combination"""
+        keys = [
+            (section, question_type, difficulty)
+            for section in self.syllabus
+            for question_type in self.syllabus_question_types(section)
+            for difficulty in DIFFICULTY_LEVELS
+        ]
+        self.question_pool = QuestionPool(
+            self.generate_questions_batch, keys,
+            target_depth=target_depth, low_water=low_water, workers=workers
+        )
+        self.question_pool.start()
+        return self.question_pool
+
+    def generate_question_with_ai(self, section: str, question_type: str, difficulty: str,
+                                  translate: bool = False) -> IELTSQuestion:
+        """Generate new questions using OpenAI API based on PYQ patterns.
+
+        Questions are served from the question pool when one is enabled and
+        has a ready question; otherwise a live completion is requested.
+        The Arabic translation is only fetched when ``translate`` is set;
+        otherwise call ``ensure_arabic_translation`` when it is shown.
+        """
+        question = self._take_pooled_question(section, question_type, difficulty)
+        if question is None:
+            try:
+                question = self._request_ai_question(section, question_type, difficulty)
+            except Exception as e:
+                # Fallback to PYQ if AI generation fails
+                return self.get_pyq_question(section, question_type, translate=translate)
+        
+        if translate:
+            self.ensure_arabic_translation(question)
+        return question
+
+    async def agenerate_question_with_ai(self, section: str, question_type: str, difficulty: str,
+                                         translate: bool = False) -> IELTSQuestion:
+        """Async version of ``generate_question_with_ai``"""
+        question = self._take_pooled_question(section, question_type, difficulty)
+        if question is None:
+            try:
+                response = await self._acreate_completion(
+                    self._completion_kwargs(section, question_type, difficulty)
+                )
+                question = self._parse_ai_question(response, question_type, difficulty)
+            except Exception as e:
+                return await self.aget_pyq_question(section, question_type, translate=translate)
+        
+        if translate:
+            await self.aensure_arabic_translation(question)
+        return question
+
+    def stream_question_with_ai(self, section: str, question_type: str, difficulty: str,
+                                translate: bool = False) -> Iterator[IELTSQuestion]:
+        """Generate a question, yielding it progressively as the completion streams in.
+        
+        Each yielded question holds the fields decoded so far (the question
+        text first, then options, answer and explanation); the last one is
+        the complete, validated question and is the one to keep. A pooled
+        question, or the PYQ fallback if generation fails, is yielded once.
+        Streams are not coalesced with identical requests.
+        """
+        question = self._take_pooled_question(section, question_type, difficulty)
+        if question is None:
+            content = ""
+            partial = None
+            try:
+                for delta in self._stream_completion(self._completion_kwargs(section, question_type, difficulty)):
+                    content += delta
+                    update = self._partial_question(content, question_type, difficulty)
+                    if update is not None and update != partial:
+                        partial = update
+                        yield partial
+                question = self._question_from_data(
+                    json.loads(self._strip_code_fence(content)), question_type, difficulty
+                )
+            except Exception as e:
+                question = self.get_pyq_question(section, question_type)
+        
+        if translate:
+            self.ensure_arabic_translation(question)
+        yield question
+
+    async def astream_question_with_ai(self, section: str, question_type: str, difficulty: str,
+                                       translate: bool = False) -> AsyncIterator[IELTSQuestion]:
+        """Async version of ``stream_question_with_ai``"""
+        question = self._take_pooled_question(section, question_type, difficulty)
+        if question is None:
+            content = ""
+            partial = None
+            try:
+                kwargs = self._completion_kwargs(section, question_type, difficulty)
+                async for delta in self._astream_completion(kwargs):
+                    content += delta
+                    update = self._partial_question(content, question_type, difficulty)
+                    if update is not None and update != partial:
+                        partial = update
+                        yield partial
+                question = self._question_from_data(
+                    json.loads(self._strip_code_fence(content)), question_type, difficulty
+                )
+            except Exception as e:
+                question = await self.aget_pyq_question(section, question_type)
+        
+        if translate:
+            await self.aensure_arabic_translation(question)
+        yield question
+
+    def generate_questions_batch(self, section: str, question_type: str, difficulty: str,
+                                 n: int) -> List[IELTSQuestion]:
+        """Generate ``n`` questions with a single completion.
+
+        Each item of the returned JSON array is validated on its own, so a
+        malformed item is dropped without discarding the rest. Raises if the
+        completion fails or is not a JSON array.
+        """
+        response = self._create_completion(self._completion_kwargs(section, question_type, difficulty, n))
+        items = json.loads(self._strip_code_fence(response.choices[0].message.content))
+        if isinstance(items, dict):
+            items = items.get("questions")
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array of questions")
+        
+        questions = []
+        for item in items[:n]:
+            try:
+                questions.append(self._question_from_data(item, question_type, difficulty))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return questions
+
+    def _take_pooled_question(self, section: str, question_type: str, difficulty: str):
+        if self.question_pool is None:
+            return None
+        return self.question_pool.take(section, question_type, difficulty)
+
+    def _request_ai_question(self, section: str, question_type: str, difficulty: str) -> IELTSQuestion:
+        """Run one live completion; unlike the public method this raises on failure"""
+        response = self._create_completion(self._completion_kwargs(section, question_type, difficulty))
+        return self._parse_ai_question(response, question_type, difficulty)
+
+    def _create_completion(self, kwargs: Dict):
+        """Run a completion through the circuit breaker, coalescing deterministic ones"""
+        def create():
+            return self.openai_breaker.call(lambda: openai.ChatCompletion.create(**kwargs))
+        
+        key = self._generation_key(kwargs)
+        return create() if key is None else self.singleflight.do(key, create)
+
+    async def _acreate_completion(self, kwargs: Dict):
+        """Async version of ``_create_completion``"""
+        openai.aiosession.set(await self._get_aiohttp_session())
+        
+        def create():
+            return self.openai_breaker.acall(lambda: openai.ChatCompletion.acreate(**kwargs))
+        
+        key = self._generation_key(kwargs)
+        return await (create() if key is None else self.async_singleflight.do(key, create))
+
+    def _stream_completion(self, kwargs: Dict) -> Iterator[str]:
+        """Yield the content deltas of a streamed completion, reporting to the circuit breaker"""
+        if not self.openai_breaker.allow_request():
+            raise CircuitOpenError(f"{self.openai_breaker.name} circuit is open")
+        try:
+            for chunk in openai.ChatCompletion.create(stream=True, **kwargs):
+                yield chunk["choices"][0]["delta"].get("content") or ""
+        except Exception:
+            self.openai_breaker.record_failure()
+            raise
+        except GeneratorExit:
+            # The consumer stopped reading early; the upstream itself was fine
+            self.openai_breaker.record_success()
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no verdict on the upstream
+            self.openai_breaker.release()
+            raise
+        self.openai_breaker.record_success()
+
+    async def _astream_completion(self, kwargs: Dict) -> AsyncIterator[str]:
+        """Async version of ``_stream_completion``"""
+        openai.aiosession.set(await self._get_aiohttp_session())
+        if not self.openai_breaker.allow_request():
+            raise CircuitOpenError(f"{self.openai_breaker.name} circuit is open")
+        try:
+            async for chunk in await openai.ChatCompletion.acreate(stream=True, **kwargs):
+                yield chunk["choices"][0]["delta"].get("content") or ""
+        except Exception:
+            self.openai_breaker.record_failure()
+            raise
+        except GeneratorExit:
+            self.openai_breaker.record_success()
+            raise
+        except BaseException:
+            self.openai_breaker.release()
+            raise
+        self.openai_breaker.record_success()
+
+    def _partial_question(self, content: str, question_type: str, difficulty: str) -> Optional[IELTSQuestion]:
+        """Question built from a streamed JSON prefix, or None before any question text arrives"""
+        data = parse_partial_json(content)
+        if not isinstance(data, dict) or not isinstance(data.get("question"), str) or not data["question"]:
+            return None
+        options = data.get("options")
+        return IELTSQuestion(
+            question_type=question_type,
+            difficulty=difficulty,
+            question=data["question"],
+            options=[option for option in options if isinstance(option, str)] if isinstance(options, list) else None,
+            correct_answer=data.get("correct_answer"),
+            explanation=data.get("explanation")
+        )
+
+    def _completion_kwargs(self, section: str, question_type: str, difficulty: str,
+                           n: int = None) -> Dict:
+        if n is None:
+            request = f"Generate an IELTS {section} question of type '{question_type}' with {difficulty} difficulty level."
+            response_format = "Format your response as JSON with these fields:"
+        else:
+            request = f"Generate {n} different IELTS {section} questions of type '{question_type}' with {difficulty} difficulty level."
+            response_format = f"Format your response as a JSON array of {n} objects, each with these fields:"
         
         prompt = f"""
-        Generate an IELTS {section} question of type '{question_type}' with {difficulty} difficulty level.
+        {request}
         Make it similar to actual IELTS exam questions, suitable for Omani students.
         
-        Format your response as JSON with these fields:
+        {response_format}
         - question: the main question text
         - options: list of options (if applicable)  
         - correct_answer: the correct answer
@@ -154,42 +581,67 @@ class IELTSAIModel:
         Difficulty: {difficulty}
         """
         
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.7
-            )
-            
-            content = response.choices[0].message.content
-            question_data = json.loads(content)
-            
-            question = IELTSQuestion(
-                question_type=question_type,
-                difficulty=difficulty,
-                question=question_data["question"],
-                options=question_data.get("options"),
-                correct_answer=question_data["correct_answer"],
-                explanation=question_data["explanation"],
-                arabic_translation=self.translate_to_arabic(question_data["question"])
-            )
-            
-            return question
-            
-        except Exception as e:
-            # Fallback to PYQ if AI generation fails
-            return self.get_pyq_question(section, question_type)
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [{"role": "user", "content": prompt}],
+            # One question needs up to ~500 tokens; stay inside the model's context
+            "max_tokens": 500 if n is None else min(500 * n, 3000),
+            "temperature": self.generation_temperature,
+            "request_timeout": self.timeout
+        }
+
+    @staticmethod
+    def _generation_key(kwargs: Dict):
+        """Single-flight key for a completion, or None if it is not deterministic"""
+        if kwargs["temperature"] != 0:
+            return None
+        return ("generate", kwargs["model"], kwargs["max_tokens"], json.dumps(kwargs["messages"]))
 
-    def get_pyq_question(self, section: str, question_type: str = None) -> IELTSQuestion:
-        """Get a random previous year question"""
-        section_questions = self.pyq_database.get(section, [])
+    @staticmethod
+    def _strip_code_fence(content: str) -> str:
+        """Remove a Markdown code fence the model sometimes wraps JSON in"""
+        content = content.strip()
+        if content.startswith("```"):
+            content = content.split("\n", 1)[1] if "\n" in content else ""
+            content = content.rsplit("```", 1)[0]
+        return content
+
+    def _parse_ai_question(self, response, question_type: str, difficulty: str) -> IELTSQuestion:
+        content = response.choices[0].message.content
+        question_data = json.loads(self._strip_code_fence(content))
+        return self._question_from_data(question_data, question_type, difficulty)
+
+    def _question_from_data(self, question_data: Dict, question_type: str, difficulty: str) -> IELTSQuestion:
+        """Build a question from one decoded JSON object, raising if it is malformed"""
+        if not isinstance(question_data, dict):
+            raise ValueError("Expected a JSON object")
+        if not isinstance(question_data.get("question"), str) or not question_data["question"].strip():
+            raise ValueError("Question text is missing")
+        options = question_data.get("options")
+        if options is not None and not isinstance(options, list):
+            raise ValueError("Options must be a list")
         
-        if question_type:
-            filtered_questions = [q for q in section_questions if q["type"] == question_type]
-            section_questions = filtered_questions if filtered_questions else section_questions
+        return IELTSQuestion(
+            question_type=question_type,
+            difficulty=difficulty,
+            question=question_data["question"],
+            options=options,
+            correct_answer=question_data["correct_answer"],
+            explanation=question_data["explanation"]
+        )
+
+    def get_pyq_question(self, section: str, question_type: str = None,
+                         translate: bool = False, difficulty: str = None,
+                         sampler: QuestionSampler = None) -> IELTSQuestion:
+        """Get a random previous year question.
+
+        Filters that match nothing are relaxed (difficulty first, then type)
+        so a question from the section is still returned. Pass the user's
+        ``sampler`` to avoid repeats until the filtered pool is exhausted.
+        """
+        question_id = self.question_store.choose_id(section, question_type, difficulty, sampler=sampler)
         
-        if not section_questions:
+        if question_id is None:
             return IELTSQuestion(
                 question_type="Sample",
                 difficulty="medium", 
@@ -197,7 +649,7 @@ class IELTSAIModel:
                 arabic_translation="لا توجد أسئلة متاحة لهذا القسم حتى الآن."
             )
         
-        pyq = random.choice(section_questions)
+        pyq = self.question_store.get(question_id)
         
         question = IELTSQuestion(
             question_type=pyq["type"],
@@ -206,11 +658,61 @@ class IELTSAIModel:
             options=pyq.get("options"),
             correct_answer=pyq.get("answer"),
             explanation=pyq.get("explanation"),
-            arabic_translation=self.translate_to_arabic(pyq["question"])
+            passage=pyq.get("passage"),
+            question_id=question_id
         )
         
+        if translate:
+            self.ensure_arabic_translation(question)
         return question
 
+    async def aget_pyq_question(self, section: str, question_type: str = None,
+                                translate: bool = False, difficulty: str = None,
+                                sampler: QuestionSampler = None) -> IELTSQuestion:
+        """Async version of ``get_pyq_question``; the store is read off the event loop"""
+        question = await asyncio.to_thread(
+            self.get_pyq_question, section, question_type, difficulty=difficulty, sampler=sampler
+        )
+        if translate:
+            await self.aensure_arabic_translation(question)
+        return question
+
+    def get_adaptive_question(self, section: str, ability: AbilityEstimate,
+                              sampler: QuestionSampler = None, translate: bool = False) -> IELTSQuestion:
+        """Get a PYQ whose difficulty suits the student's current ability"""
+        difficulty = self.adaptive.choose_difficulty(section, ability)
+        return self.get_pyq_question(section, translate=translate, difficulty=difficulty, sampler=sampler)
+
+    async def aget_adaptive_question(self, section: str, ability: AbilityEstimate,
+                                     sampler: QuestionSampler = None, translate: bool = False) -> IELTSQuestion:
+        """Async version of ``get_adaptive_question``; the store is read off the event loop"""
+        question = await asyncio.to_thread(self.get_adaptive_question, section, ability, sampler=sampler)
+        if translate:
+            await self.aensure_arabic_translation(question)
+        return question
+
+    def update_ability(self, section: str, ability: AbilityEstimate, question: IELTSQuestion, score: float):
+        """Update the student's ability and the question's difficulty after an answer.
+
+        Questions without a correct answer (writing, speaking and many AI
+        questions) cannot be graded here, so they leave both unchanged.
+        """
+        if question.correct_answer is None:
+            return
+        self.adaptive.update(section, ability, question.question_id, question.difficulty, score)
+
+    def ensure_arabic_translation(self, question: IELTSQuestion) -> str:
+        """Translate a question on first use and memoize it on the question"""
+        if question.arabic_translation is None:
+            question.arabic_translation = self.translate_to_arabic(question.question)
+        return question.arabic_translation
+
+    async def aensure_arabic_translation(self, question: IELTSQuestion) -> str:
+        """Async version of ``ensure_arabic_translation``"""
+        if question.arabic_translation is None:
+            question.arabic_translation = await self.atranslate_to_arabic(question.question)
+        return question.arabic_translation
+
     def evaluate_answer(self, question: IELTSQuestion, user_answer: str) -> Dict:
         """Evaluate user's answer and provide feedback"""
         is_correct = False
@@ -260,22 +762,29 @@ class IELTSAIModel:
         
         return plan
 
-    def get_band_score_prediction(self, practice_scores: Dict[str, List[float]]) -> Dict:
-        """Predict likely IELTS band score based on practice performance"""
+    def get_band_score_prediction(self, practice_scores: Dict[str, ScoreHistory]) -> Dict:
+        """Predict likely IELTS band score based on practice performance.
+        
+        Uses the running aggregates of each ``ScoreHistory``, so the cost does
+        not grow with the number of answered questions. Plain lists still work.
+        """
         
         section_scores = {}
+        recent_section_scores = {}
         for section, scores in practice_scores.items():
             if scores:
-                avg_score = sum(scores) / len(scores)
+                if not isinstance(scores, ScoreHistory):
+                    scores = ScoreHistory(scores)
                 # Convert to IELTS band scale (1-9)
-                band_score = min(9.0, max(1.0, (avg_score * 9)))
-                section_scores[section] = round(band_score, 0.5)
+                section_scores[section] = to_band(scores.mean())
+                recent_section_scores[section] = to_band(scores.recent_mean())
         
         overall_band = sum(section_scores.values()) / len(section_scores) if section_scores else 5.0
         
         prediction = {
             "section_scores": section_scores,
-            "overall_band": round(overall_band, 0.5),
+            "recent_section_scores": recent_section_scores,
+            "overall_band": round_half_band(overall_band),
             "improvement_areas": [],
             "strengths": []
         }
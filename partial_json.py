@@ -0,0 +1,74 @@
+import json
+from typing import Any, List, Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+_decoder = json.JSONDecoder()
+
+
+def _scan(text: str):
+    """Open brackets, string state and structural cut points of a JSON prefix"""
+    stack: List[str] = []
+    cuts: List[int] = []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+            cuts.append(i + 1)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            cuts.append(i)
+    return stack, in_string, escaped, cuts
+
+
+def _close(prefix: str) -> str:
+    """Turn a JSON prefix into a document by closing the open string and brackets"""
+    stack, in_string, escaped, _ = _scan(prefix)
+    if in_string:
+        prefix = (prefix[:-1] if escaped else prefix) + '"'
+    prefix = prefix.rstrip()
+    if prefix.endswith(","):
+        prefix = prefix[:-1]
+    elif prefix.endswith(":"):
+        prefix += " null"
+    return prefix + "".join(_CLOSERS[bracket] for bracket in reversed(stack))
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """Best-effort decode of a JSON document that is still being streamed.
+
+    Open strings, arrays and objects are closed as they stand, so a value
+    that is still arriving shows up truncated. Where that is not enough
+    (a half-written key, number or literal) the text is cut back to the
+    last comma or opening bracket. Text before the first ``{`` or ``[``,
+    such as a Markdown code fence, is skipped. Returns None if nothing
+    decodable has arrived yet.
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        return None
+    text = text[min(starts):]
+    try:
+        # raw_decode ignores anything after the document, e.g. a closing fence
+        return _decoder.raw_decode(text)[0]
+    except ValueError:
+        pass
+
+    _, _, _, cuts = _scan(text)
+    candidates = [text] + [text[:cut] for cut in reversed(cuts)]
+    for candidate in candidates:
+        try:
+            return json.loads(_close(candidate))
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,73 @@
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, Hashable, Optional
+
+
+class Prefetcher:
+    """Single-slot, per-user prefetch of the next item.
+
+    ``prefetch(key, build)`` starts building the next item on ``executor``
+    while the user is busy with the current one; ``take(key, build)`` hands
+    it over, waiting if it is already being built, or builds one inline if
+    nothing was prefetched for that key or the build has not started yet
+    (e.g. the shared executor is busy with other users' prefetches). Prefetching for a different key
+    (or ``cancel``) discards the pending item. Only one build runs at a
+    time: while a discarded build is still running, ``prefetch`` does
+    nothing and ``take`` builds inline.
+    """
+
+    def __init__(self, executor: Executor):
+        self.executor = executor
+        self.key: Optional[Hashable] = None
+        self._future: Optional[Future] = None
+        self._abandoned: Optional[Future] = None
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+
+    def prefetch(self, key: Hashable, build: Callable):
+        if self._future is not None and self.key == key:
+            return
+        self.cancel()
+        if self._abandoned is not None and not self._abandoned.done():
+            return
+        self._abandoned = None
+        self.key = key
+        self._future = self.executor.submit(build)
+
+    def take(self, key: Hashable, build: Callable):
+        future = self._future if self.key == key else None
+        self.key = None
+        self._future = None
+        # A build still queued behind other sessions' work is dropped, not waited for
+        if future is not None and not future.cancel():
+            try:
+                item = future.result()
+                self.hits += 1
+                return item
+            except Exception:
+                pass  # fall back to building it now
+        self.misses += 1
+        return build()
+
+    def retarget(self, key: Hashable):
+        """Drop the pending item if it was built for another key"""
+        if self._future is not None and self.key != key:
+            self.cancel()
+
+    def cancel(self):
+        if self._future is not None:
+            if not self._future.cancel():
+                # Already started: it runs to completion and its result is dropped
+                self._abandoned = self._future
+            self.cancelled += 1
+        self.key = None
+        self._future = None
+
+    def stats(self) -> Dict:
+        return {
+            "key": self.key,
+            "pending": self._future is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,163 @@
+from array import array
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+# Fractional scores are stored as bytes in steps of 1/SCORE_SCALE
+SCORE_SCALE = 200
+# Number of latest scores behind ``ScoreHistory.recent_mean``
+RECENT_WINDOW = 20
+# Practice-history entries kept in memory per session
+PRACTICE_HISTORY_CAPACITY = 50
+
+
+class ScoreHistory:
+    """Compact, append-only list of practice scores in [0, 1].
+
+    Right/wrong (0/1) results are bit-packed, eight to a byte. The first
+    fractional score switches the history to one byte per score (steps of
+    1/200). A running total and count, plus the total of the last
+    ``window`` scores, are kept on append so ``total``, ``mean``,
+    ``recent_mean`` and ``len`` never walk the history. Indexing, slicing
+    and iteration behave like the plain list this replaces.
+    """
+
+    __slots__ = ("_bits", "_bytes", "_count", "_total", "_recent_total", "window")
+
+    def __init__(self, scores: Iterable[float] = (), window: int = RECENT_WINDOW):
+        self._bits = bytearray()
+        self._bytes = None
+        self._count = 0
+        self._total = 0.0
+        self._recent_total = 0.0
+        self.window = window
+        self.extend(scores)
+
+    def append(self, score: float):
+        score = min(1.0, max(0.0, float(score)))
+        if self._bytes is None and score not in (0.0, 1.0):
+            self._unpack_bits()
+        if self._bytes is None:
+            byte_index, bit = divmod(self._count, 8)
+            if bit == 0:
+                self._bits.append(0)
+            if score:
+                self._bits[byte_index] |= 1 << bit
+        else:
+            step = round(score * SCORE_SCALE)
+            self._bytes.append(step)
+            score = step / SCORE_SCALE
+        self._count += 1
+        self._total += score
+        self._recent_total += score
+        if self._count > self.window:
+            self._recent_total -= self._get(self._count - 1 - self.window)
+
+    def extend(self, scores: Iterable[float]):
+        for score in scores:
+            self.append(score)
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    def mean(self) -> float:
+        return self._total / self._count if self._count else 0.0
+
+    def recent_mean(self) -> float:
+        """Mean of the last ``window`` scores"""
+        recent = min(self._count, self.window)
+        return self._recent_total / recent if recent else 0.0
+
+    def _get(self, index: int) -> Union[int, float]:
+        if self._bytes is None:
+            return (self._bits[index >> 3] >> (index & 7)) & 1
+        return self._bytes[index] / SCORE_SCALE
+
+    def _unpack_bits(self):
+        self._bytes = array("B", (SCORE_SCALE * self._get(i) for i in range(self._count)))
+        self._bits = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Union[int, float]]:
+        for index in range(self._count):
+            yield self._get(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("score index out of range")
+        return self._get(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (ScoreHistory, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"ScoreHistory({list(self)})"
+
+    def tolist(self) -> List[Union[int, float]]:
+        return list(self)
+
+    def nbytes(self) -> int:
+        """Bytes used by the packed scores themselves"""
+        if self._bytes is None:
+            return len(self._bits)
+        return len(self._bytes) * self._bytes.itemsize
+
+
+class PracticeHistory:
+    """Bounded practice log: a ring buffer of the latest entries.
+
+    Entries are dicts with at least a ``date``. Once ``capacity`` entries
+    are buffered, each new one pushes the oldest out to ``archive`` (e.g. the
+    session store). The set of practice days is kept as entries arrive, so
+    ``practice_days`` is O(1) and ``recent(k)`` is O(k).
+    """
+
+    __slots__ = ("_entries", "_days", "_total", "archive")
+
+    def __init__(self, capacity: int = PRACTICE_HISTORY_CAPACITY, archive: Optional[Callable] = None):
+        self._entries = deque(maxlen=capacity)
+        self._days = set()
+        self._total = 0
+        self.archive = archive
+
+    def append(self, entry: Dict):
+        if len(self._entries) == self._entries.maxlen and self.archive is not None:
+            self.archive(self._entries[0])
+        self._entries.append(entry)
+        self._days.add(entry["date"].date())
+        self._total += 1
+
+    def recent(self, k: int = 10) -> List[Dict]:
+        """Latest ``k`` entries, newest first"""
+        return list(islice(reversed(self._entries), k))
+
+    @property
+    def practice_days(self) -> int:
+        return len(self._days)
+
+    @property
+    def total(self) -> int:
+        """Entries ever recorded, including archived ones"""
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._entries)
+
+
+def summarize(histories: Dict[str, ScoreHistory]) -> Dict:
+    """Overall question count and accuracy across sections, from the running totals"""
+    count = sum(len(history) for history in histories.values())
+    total = sum(history.total for history in histories.values())
+    return {"total_questions": count, "accuracy": total / count if count else 0.0}
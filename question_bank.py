@@ -0,0 +1,500 @@
+import argparse
+import json
+import mmap
+import os
+import random
+import sqlite3
+import struct
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sampler import QuestionSampler
+
+DEFAULT_DIFFICULTY = "medium"
+DEFAULT_QUESTION_DB_PATH = os.getenv("IELTS_QUESTION_DB", os.path.join("data", "question_bank.db"))
+# Optional compact bank file (see write_bank_file); used instead of SQLite when set
+QUESTION_BANK_FILE = os.getenv("IELTS_QUESTION_BANK_FILE")
+
+RECORD_FIELDS = ("section", "type", "difficulty", "question", "options", "answer", "explanation", "passage")
+
+# Built-in Previous Year Questions, seeded into the default store
+PYQ_DATABASE = {
+    "listening": [
+        {
+            "type": "Multiple Choice",
+            "question": "What time does the library close on weekends?",
+            "options": ["A) 6:00 PM", "B) 8:00 PM", "C) 9:00 PM", "D) 10:00 PM"],
+            "answer": "B",
+            "difficulty": "easy"
+        },
+        {
+            "type": "Form Completion",
+            "question": "Complete the form with the missing information about the student accommodation.",
+            "answer": "shared kitchen",
+            "difficulty": "medium"
+        }
+    ],
+    "reading": [
+        {
+            "type": "True/False/Not Given",
+            "question": "The research shows that climate change affects bird migration patterns.",
+            "answer": "True",
+            "difficulty": "medium",
+            "passage": "Recent studies have demonstrated significant impacts of climate change on avian migration routes..."
+        }
+    ],
+    "writing": [
+        {
+            "type": "Task 1",
+            "question": "The chart shows the percentage of households with different types of internet connections in three countries. Summarize the information.",
+            "difficulty": "medium"
+        },
+        {
+            "type": "Task 2", 
+            "question": "Some people think that universities should accept equal numbers of male and female students in every subject. To what extent do you agree or disagree?",
+            "difficulty": "hard"
+        }
+    ],
+    "speaking": [
+        {
+            "type": "Part 1",
+            "question": "Do you prefer to study in the morning or evening? Why?",
+            "difficulty": "easy"
+        },
+        {
+            "type": "Part 2",
+            "question": "Describe a memorable journey you have taken. You should say: where you went, who you went with, what you did there, and explain why it was memorable.",
+            "difficulty": "medium"
+        }
+    ]
+}
+
+
+class QuestionStore:
+    """Interface for PYQ storage backends.
+
+    Selection only needs ``count`` and ``id_at``; the full record (passage,
+    explanation, ...) is loaded with ``get`` once a question is picked.
+    """
+
+    def add(self, section: str, record: Dict) -> int:
+        raise NotImplementedError
+
+    def count(self, section: str, question_type: str = None, difficulty: str = None) -> int:
+        raise NotImplementedError
+
+    def id_at(self, section: str, question_type: str, difficulty: str, position: int) -> int:
+        """The question id at ``position`` among those matching the filter"""
+        raise NotImplementedError
+
+    def get(self, question_id: int) -> Dict:
+        raise NotImplementedError
+
+    def iter_question_texts(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Every full record, for exporting the bank"""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def seed(self, questions: Dict[str, List[Dict]]):
+        for section, section_questions in questions.items():
+            for record in section_questions:
+                self.add(section, record)
+
+    def resolve_filters(self, section: str, question_type: str = None,
+                        difficulty: str = None) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Relax filters until some question matches.
+
+        Tries the exact filter, then drops difficulty, then type, then both.
+        Returns the (type, difficulty) that matched, or None for an empty
+        section.
+        """
+        for candidate in ((question_type, difficulty), (question_type, None),
+                          (None, difficulty), (None, None)):
+            if self.count(section, *candidate):
+                return candidate
+        return None
+
+    def choose_id(self, section: str, question_type: str = None, difficulty: str = None,
+                  rng: random.Random = random, sampler: QuestionSampler = None) -> Optional[int]:
+        """Pick a random matching question id, relaxing filters if needed.
+
+        With a ``sampler`` the pick comes from that user's shuffle, so
+        questions do not repeat until the filtered pool is exhausted.
+        """
+        filters = self.resolve_filters(section, question_type, difficulty)
+        if filters is None:
+            return None
+        key = (section,) + filters
+        n = self.count(*key)
+        position = sampler.next_position(key, n) if sampler is not None else rng.randrange(n)
+        return self.id_at(*key, position)
+
+
+class QuestionBank(QuestionStore):
+    """In-memory question store indexed on (section, type, difficulty).
+
+    Every question is listed under all four combinations of its type and
+    difficulty with wildcards, so counting and random selection for any
+    filter is a dict lookup plus a list index.
+    """
+
+    def __init__(self, questions: Dict[str, List[Dict]] = None):
+        self._records: List[Dict] = []
+        self._index: Dict[Tuple, List[int]] = {}
+        self.seed(questions or {})
+
+    def add(self, section: str, record: Dict) -> int:
+        """Add a question and update the indexes in place; returns its id"""
+        question_id = len(self._records)
+        record = dict(record, section=section, id=question_id)
+        record.setdefault("difficulty", DEFAULT_DIFFICULTY)
+        self._records.append(record)
+        for question_type in (record["type"], None):
+            for difficulty in (record["difficulty"], None):
+                self._index.setdefault((section, question_type, difficulty), []).append(question_id)
+        return question_id
+
+    def count(self, section: str, question_type: str = None, difficulty: str = None) -> int:
+        return len(self._index.get((section, question_type, difficulty), ()))
+
+    def id_at(self, section: str, question_type: str, difficulty: str, position: int) -> int:
+        return self._index[(section, question_type, difficulty)][position]
+
+    def get(self, question_id: int) -> Dict:
+        return self._records[question_id]
+
+    def iter_question_texts(self) -> Iterator[str]:
+        return (record["question"] for record in self._records)
+
+    def iter_records(self) -> Iterator[Dict]:
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+
+class SQLiteQuestionStore(QuestionStore):
+    """SQLite question store; only ids are read during selection.
+
+    Counts and the sorted id list per filter are cached in memory (one
+    indexed range scan the first time a filter is used) and invalidated by
+    ``add`` and ``seed``, so picking a position is a list index rather than
+    an OFFSET scan. Seeding is idempotent: a question already stored for a
+    section is skipped.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUESTION_DB_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple, int] = {}
+        self._ids: Dict[Tuple, array] = {}
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "id INTEGER PRIMARY KEY, section TEXT NOT NULL, type TEXT NOT NULL, "
+            "difficulty TEXT NOT NULL, question TEXT NOT NULL, options TEXT, answer TEXT, "
+            "explanation TEXT, passage TEXT, UNIQUE (section, question))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS questions_filter ON questions (section, type, difficulty, id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS questions_section_difficulty ON questions (section, difficulty, id)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS questions_section ON questions (section, id)")
+        self._conn.commit()
+
+    _INSERT = (
+        "INSERT OR IGNORE INTO questions (section, type, difficulty, question, options, "
+        "answer, explanation, passage) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    @staticmethod
+    def _row(section: str, record: Dict) -> Tuple:
+        options = record.get("options")
+        return (
+            section, record["type"], record.get("difficulty", DEFAULT_DIFFICULTY), record["question"],
+            json.dumps(options) if options is not None else None,
+            record.get("answer"), record.get("explanation"), record.get("passage")
+        )
+
+    def seed(self, questions: Dict[str, List[Dict]]):
+        rows = [self._row(section, record) for section, records in questions.items() for record in records]
+        with self._lock:
+            self._conn.executemany(self._INSERT, rows)
+            self._conn.commit()
+            self._invalidate()
+
+    def add(self, section: str, record: Dict) -> int:
+        with self._lock:
+            cursor = self._conn.execute(self._INSERT, self._row(section, record))
+            self._conn.commit()
+            if cursor.rowcount:
+                self._invalidate()
+                return cursor.lastrowid
+            return self._conn.execute(
+                "SELECT id FROM questions WHERE section = ? AND question = ?", (section, record["question"])
+            ).fetchone()[0]
+
+    def _invalidate(self):
+        # Called with the lock held
+        self._counts.clear()
+        self._ids.clear()
+
+    @staticmethod
+    def _where(section: str, question_type: Optional[str], difficulty: Optional[str]) -> Tuple[str, Tuple]:
+        clauses = ["section = ?"]
+        params = [section]
+        if question_type is not None:
+            clauses.append("type = ?")
+            params.append(question_type)
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        return " AND ".join(clauses), tuple(params)
+
+    def count(self, section: str, question_type: str = None, difficulty: str = None) -> int:
+        key = (section, question_type, difficulty)
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                where, params = self._where(*key)
+                count = self._counts[key] = self._conn.execute(
+                    f"SELECT COUNT(*) FROM questions WHERE {where}", params
+                ).fetchone()[0]
+        return count
+
+    def id_at(self, section: str, question_type: str, difficulty: str, position: int) -> int:
+        key = (section, question_type, difficulty)
+        with self._lock:
+            ids = self._ids.get(key)
+            if ids is None:
+                where, params = self._where(*key)
+                ids = self._ids[key] = array("q", (
+                    row[0] for row in self._conn.execute(f"SELECT id FROM questions WHERE {where} ORDER BY id", params)
+                ))
+        return ids[position]
+
+    def get(self, question_id: int) -> Dict:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT id, {', '.join(RECORD_FIELDS)} FROM questions WHERE id = ?", (question_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(question_id)
+        return self._record_from_row(row)
+
+    @staticmethod
+    def _record_from_row(row: Tuple) -> Dict:
+        record = dict(zip(("id",) + RECORD_FIELDS, row))
+        if record["options"] is not None:
+            record["options"] = json.loads(record["options"])
+        return record
+
+    def iter_question_texts(self) -> Iterator[str]:
+        with self._lock:
+            texts = [row[0] for row in self._conn.execute("SELECT question FROM questions")]
+        return iter(texts)
+
+    def iter_records(self) -> Iterator[Dict]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id, {', '.join(RECORD_FIELDS)} FROM questions").fetchall()
+        return (self._record_from_row(row) for row in rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+
+# Bank file layout (all integers little-endian):
+#   header    magic, version, field count, record count and section offsets
+#   index     one fixed-width entry per record: payload offset of the record
+#             followed by the cumulative end offset of each field
+#   directory JSON list of [section, type, difficulty, first record, count];
+#             records are sorted by those keys so each one is a contiguous run
+#   payload   UTF-8 field values (options as JSON, empty for None)
+_BANK_MAGIC = b"IELTSQB1"
+_BANK_HEADER = struct.Struct("<8sIIQQQQQ")
+_BANK_ENTRY = struct.Struct("<Q%dI" % len(RECORD_FIELDS))
+
+
+def write_bank_file(records: Iterable[Dict], path: str) -> int:
+    """Write records to a compact bank file readable by MmapQuestionStore"""
+    records = sorted(
+        records,
+        key=lambda r: (r["section"], r["type"], r.get("difficulty") or DEFAULT_DIFFICULTY, r.get("id") or 0)
+    )
+
+    directory = []
+    for position, record in enumerate(records):
+        key = [record["section"], record["type"], record.get("difficulty") or DEFAULT_DIFFICULTY]
+        if directory and directory[-1][:3] == key:
+            directory[-1][4] += 1
+        else:
+            directory.append(key + [position, 1])
+    directory_bytes = json.dumps(directory).encode("utf-8")
+
+    index = bytearray()
+    payload = bytearray()
+    for record in records:
+        start = len(payload)
+        ends = []
+        for field in RECORD_FIELDS:
+            value = record.get(field)
+            if field == "difficulty":
+                value = value or DEFAULT_DIFFICULTY
+            if field == "options" and value is not None:
+                value = json.dumps(value)
+            payload += (value or "").encode("utf-8")
+            ends.append(len(payload) - start)
+        index += _BANK_ENTRY.pack(start, *ends)
+
+    index_offset = _BANK_HEADER.size
+    directory_offset = index_offset + len(index)
+    payload_offset = directory_offset + len(directory_bytes)
+    with open(path, "wb") as f:
+        f.write(_BANK_HEADER.pack(
+            _BANK_MAGIC, 1, len(RECORD_FIELDS), len(records),
+            index_offset, directory_offset, len(directory_bytes), payload_offset
+        ))
+        f.write(index)
+        f.write(directory_bytes)
+        f.write(payload)
+    return len(records)
+
+
+class MmapQuestionStore(QuestionStore):
+    """Read-only store over a bank file written by ``write_bank_file``.
+
+    Opening only reads the header and the small key directory, so startup
+    does not grow with the bank. Records are decoded one at a time straight
+    from the memory map, which every process opening the file shares
+    through the page cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, field_count, self._record_count, self._index_offset,
+         directory_offset, directory_length, self._payload_offset) = _BANK_HEADER.unpack_from(self._mmap, 0)
+        if magic != _BANK_MAGIC or version != 1 or field_count != len(RECORD_FIELDS):
+            raise ValueError(f"{path} is not a supported question bank file")
+
+        # (section, type, difficulty) with wildcards -> runs of (first record, count)
+        self._runs: Dict[Tuple, List[Tuple[int, int]]] = {}
+        directory = json.loads(self._mmap[directory_offset:directory_offset + directory_length])
+        for section, question_type, difficulty, first, count in directory:
+            for key_type in (question_type, None):
+                for key_difficulty in (difficulty, None):
+                    runs = self._runs.setdefault((section, key_type, key_difficulty), [])
+                    # Runs for one section or one section/type are adjacent, so merge them
+                    if runs and runs[-1][0] + runs[-1][1] == first:
+                        runs[-1] = (runs[-1][0], runs[-1][1] + count)
+                    else:
+                        runs.append((first, count))
+        self._counts = {key: sum(count for _, count in runs) for key, runs in self._runs.items()}
+
+    def add(self, section: str, record: Dict) -> int:
+        raise NotImplementedError("Bank files are read-only; rebuild them with write_bank_file")
+
+    def seed(self, questions: Dict[str, List[Dict]]):
+        raise NotImplementedError("Bank files are read-only; rebuild them with write_bank_file")
+
+    def count(self, section: str, question_type: str = None, difficulty: str = None) -> int:
+        return self._counts.get((section, question_type, difficulty), 0)
+
+    def id_at(self, section: str, question_type: str, difficulty: str, position: int) -> int:
+        for first, count in self._runs[(section, question_type, difficulty)]:
+            if position < count:
+                return first + position
+            position -= count
+        raise IndexError(position)
+
+    def _field(self, question_id: int, field: int) -> str:
+        entry = _BANK_ENTRY.unpack_from(self._mmap, self._index_offset + question_id * _BANK_ENTRY.size)
+        start = self._payload_offset + entry[0]
+        begin = entry[field] if field else 0
+        return self._mmap[start + begin:start + entry[field + 1]].decode("utf-8")
+
+    def get(self, question_id: int) -> Dict:
+        if not 0 <= question_id < self._record_count:
+            raise KeyError(question_id)
+        entry = _BANK_ENTRY.unpack_from(self._mmap, self._index_offset + question_id * _BANK_ENTRY.size)
+        start = self._payload_offset + entry[0]
+        record = {"id": question_id}
+        begin = 0
+        for field, end in zip(RECORD_FIELDS, entry[1:]):
+            value = self._mmap[start + begin:start + end].decode("utf-8") or None
+            record[field] = value
+            begin = end
+        if record["options"] is not None:
+            record["options"] = json.loads(record["options"])
+        return record
+
+    def iter_question_texts(self) -> Iterator[str]:
+        question_field = RECORD_FIELDS.index("question")
+        return (self._field(question_id, question_field) for question_id in range(self._record_count))
+
+    def iter_records(self) -> Iterator[Dict]:
+        return (self.get(question_id) for question_id in range(self._record_count))
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self):
+        return self._record_count
+
+
+def default_question_store() -> QuestionStore:
+    """The bank file from IELTS_QUESTION_BANK_FILE if set, else the seeded SQLite store"""
+    if QUESTION_BANK_FILE:
+        return MmapQuestionStore(QUESTION_BANK_FILE)
+    store = SQLiteQuestionStore()
+    store.seed(PYQ_DATABASE)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert between the SQLite question store and bank files")
+    parser.add_argument("command", choices=["export", "import"],
+                        help="export: SQLite -> bank file, import: bank file -> SQLite")
+    parser.add_argument("bank_file")
+    parser.add_argument("--db", default=DEFAULT_QUESTION_DB_PATH, help="SQLite question store path")
+    args = parser.parse_args()
+
+    store = SQLiteQuestionStore(args.db)
+    if args.command == "export":
+        store.seed(PYQ_DATABASE)
+        count = write_bank_file(store.iter_records(), args.bank_file)
+        print(f"Exported {count} questions to {args.bank_file}")
+    else:
+        bank = MmapQuestionStore(args.bank_file)
+        questions = {}
+        for record in bank.iter_records():
+            questions.setdefault(record["section"], []).append(record)
+        store.seed(questions)
+        bank.close()
+        print(f"Imported {len(bank)} questions into {args.db}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Tuple
+
+PoolKey = Tuple[str, str, str]
+
+
+def pool_key(section: str, question_type: str, difficulty: str) -> PoolKey:
+    return (section.lower(), question_type, difficulty.lower())
+
+
+class QuestionPool:
+    """Keeps ready-made AI questions for each (section, type, difficulty).
+
+    ``take`` never blocks: it pops a pre-generated question or returns None.
+    Whenever a key drops below ``low_water`` it is queued for background
+    workers, which call ``generate(section, type, difficulty, n)`` for the
+    missing questions until the key is back at ``target_depth``.
+    """
+
+    def __init__(self, generate: Callable[[str, str, str, int], List], keys: Iterable[PoolKey],
+                 target_depth: int = 3, low_water: int = 1, workers: int = 2,
+                 retry_delay: float = 30.0):
+        self.generate = generate
+        self.target_depth = target_depth
+        self.low_water = low_water
+        self.retry_delay = retry_delay
+        self._pools: Dict[PoolKey, deque] = {pool_key(*key): deque() for key in keys}
+        self._lock = threading.Lock()
+        self._queued = set()
+        self._refill_queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"question-pool-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.refills = 0
+        self.failures = 0
+        self.last_refill_latency = 0.0
+        self._total_refill_latency = 0.0
+
+    def start(self):
+        """Start the workers and queue every key for its initial fill"""
+        for key in self._pools:
+            self._schedule(key)
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self):
+        self._stopped.set()
+        for _ in self._workers:
+            self._refill_queue.put(None)
+
+    def take(self, section: str, question_type: str, difficulty: str):
+        """Pop a ready question for the key, or None if there is none"""
+        key = pool_key(section, question_type, difficulty)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            question = pool.popleft() if pool else None
+            if question is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if len(pool) < self.low_water:
+            self._schedule(key)
+        return question
+
+    def _schedule(self, key: PoolKey):
+        with self._lock:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+        self._refill_queue.put(key)
+
+    def _worker(self):
+        while not self._stopped.is_set():
+            key = self._refill_queue.get()
+            if key is None:
+                return
+            try:
+                self._refill(key)
+            finally:
+                with self._lock:
+                    self._queued.discard(key)
+
+    def _refill(self, key: PoolKey):
+        pool = self._pools[key]
+        while len(pool) < self.target_depth and not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                questions = self.generate(*key, self.target_depth - len(pool))
+            except Exception:
+                questions = None
+            if not questions:
+                with self._lock:
+                    self.failures += 1
+                # Leave the key for a later take() to reschedule instead of
+                # hammering a failing upstream
+                self._stopped.wait(self.retry_delay)
+                return
+
+            latency = time.monotonic() - started
+            with self._lock:
+                pool.extend(questions)
+                self.generated += len(questions)
+                self.refills += 1
+                self.last_refill_latency = latency
+                self._total_refill_latency += latency
+
+    def depth(self, section: str = None, question_type: str = None, difficulty: str = None) -> int:
+        if section is None:
+            return sum(len(pool) for pool in self._pools.values())
+        pool = self._pools.get(pool_key(section, question_type, difficulty))
+        return len(pool) if pool is not None else 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "keys": len(self._pools),
+                "depth": sum(len(pool) for pool in self._pools.values()),
+                "empty_keys": sum(1 for pool in self._pools.values() if not pool),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "generated": self.generated,
+                "refills": self.refills,
+                "failures": self.failures,
+                "pending_refills": len(self._queued),
+                "last_refill_latency": self.last_refill_latency,
+                "avg_refill_latency": self._total_refill_latency / self.refills if self.refills else 0.0,
+            }
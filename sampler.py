@@ -0,0 +1,85 @@
+import random
+from typing import Dict, Hashable, List, Tuple
+
+_MASK32 = 0xFFFFFFFF
+
+
+def _mix(value: int, seed: int, round_number: int) -> int:
+    """32-bit integer hash used as the Feistel round function"""
+    x = (value * 0x9E3779B1 + seed + round_number * 0x85EBCA77) & _MASK32
+    x ^= x >> 15
+    x = (x * 0x2C1B3C6D) & _MASK32
+    x ^= x >> 12
+    x = (x * 0x297A2D39) & _MASK32
+    x ^= x >> 15
+    return x
+
+
+def permute(index: int, n: int, seed: int, rounds: int = 4) -> int:
+    """Map ``index`` in [0, n) to its place in a pseudo-random permutation.
+
+    A small Feistel network is a bijection on the smallest even-bit domain
+    covering ``n``; cycle-walking restricts it to [0, n). Only the seed has
+    to be stored to replay the whole shuffle.
+    """
+    if n <= 1:
+        return 0
+    half_bits = ((n - 1).bit_length() + 1) // 2
+    mask = (1 << half_bits) - 1
+    x = index
+    while True:
+        left, right = x >> half_bits, x & mask
+        for round_number in range(rounds):
+            left, right = right, left ^ (_mix(right, seed, round_number) & mask)
+        x = (left << half_bits) | right
+        if x < n:
+            return x
+
+
+class QuestionSampler:
+    """Per-user sampler that never repeats a question until its pool is used up.
+
+    For each filter key it keeps a shuffle seed, the pool size and a
+    cursor, so memory stays at three integers per key no matter how many
+    questions there are or how many have been attempted. When the cursor
+    reaches the end (or the pool size changes) a new shuffle starts.
+    """
+
+    __slots__ = ("_state", "_base")
+
+    def __init__(self, state: Dict[Hashable, Tuple[int, int, int]] = None):
+        self._state = dict(state or {})
+        self._base = None
+
+    def next_position(self, key: Hashable, n: int) -> int:
+        """Next unseen position in [0, n) for the filter ``key``"""
+        seed, size, cursor = self._state.get(key, (0, -1, 0))
+        if size != n or cursor >= n:
+            seed, size, cursor = random.getrandbits(32), n, 0
+        self._state[key] = (seed, size, cursor + 1)
+        return permute(cursor, n, seed)
+
+    def remaining(self, key: Hashable, n: int) -> int:
+        seed, size, cursor = self._state.get(key, (0, -1, 0))
+        return n - cursor if size == n else n
+
+    def fork(self) -> "QuestionSampler":
+        """Copy to pick from speculatively; its picks only count once ``commit``-ted"""
+        child = QuestionSampler(self._state)
+        child._base = dict(self._state)
+        return child
+
+    def commit(self, child: "QuestionSampler"):
+        """Adopt the positions a ``fork`` used, for keys this sampler has not advanced since"""
+        for key, value in child._state.items():
+            base = child._base.get(key)
+            if value != base and self._state.get(key) == base:
+                self._state[key] = value
+
+    def to_list(self) -> List[List]:
+        """JSON-friendly state for persisting the sampler"""
+        return [list(key) + list(value) for key, value in self._state.items()]
+
+    @classmethod
+    def from_list(cls, items: List[List]) -> "QuestionSampler":
+        return cls({tuple(item[:-3]): tuple(item[-3:]) for item in items})
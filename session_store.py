@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_DB_PATH = os.getenv("IELTS_SESSION_DB", os.path.join("data", "sessions.db"))
+
+
+class SessionStore:
+    """SQLite (WAL) store for user sessions with write-behind batching.
+
+    It holds Discord sessions and scores, and the practice-history entries
+    the Streamlit app archives. ``save``, ``record_score`` and
+    ``archive_practice`` only queue the write and return at once.
+    A background thread commits the queue in one transaction every
+    ``flush_interval`` seconds, or sooner once ``flush_batch`` writes are
+    pending. Repeated saves of the same user are coalesced into one row
+    update. ``close`` flushes whatever is still queued.
+    """
+
+    def __init__(self, path: str = DEFAULT_SESSION_DB_PATH,
+                 flush_interval: float = 0.5, flush_batch: int = 200):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self._pending_sessions: Dict[int, Dict] = {}
+        self._pending_scores: List[tuple] = []
+        self._pending_practice: List[tuple] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._db_lock = threading.Lock()
+        self._closed = False
+
+        self.flushes = 0
+        self.written_sessions = 0
+        self.written_scores = 0
+        self.written_practice = 0
+        self.last_flush_latency = 0.0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "user_id INTEGER PRIMARY KEY, language TEXT, practice_mode TEXT, "
+            "state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+            "section TEXT NOT NULL, score REAL NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS scores_user ON scores (user_id, id)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS practice_log ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, answered_at REAL NOT NULL, "
+            "section TEXT, question_type TEXT, score REAL, user_answer TEXT, correct_answer TEXT)"
+        )
+        self._conn.commit()
+
+        self._writer = threading.Thread(target=self._run, name="session-store-writer", daemon=True)
+        self._writer.start()
+
+    def save(self, user_id: int, language: str, practice_mode: Optional[str], state: Dict):
+        """Queue an upsert of the user's session fields"""
+        with self._lock:
+            self._pending_sessions[user_id] = (language, practice_mode, json.dumps(state), time.time())
+            self._notify_if_full()
+
+    def record_score(self, user_id: int, section: str, score: float):
+        """Queue one answered question for the user's score history"""
+        with self._lock:
+            self._pending_scores.append((user_id, section, score, time.time()))
+            self._notify_if_full()
+
+    def archive_practice(self, session_id: str, entry: Dict):
+        """Queue a practice-history entry that dropped out of a session's recent buffer"""
+        with self._lock:
+            self._pending_practice.append((
+                session_id, entry["date"].timestamp(), entry["section"], entry["question_type"],
+                entry["score"], entry.get("user_answer"), entry.get("correct_answer")
+            ))
+            self._notify_if_full()
+
+    def load(self, user_id: int) -> Optional[Dict]:
+        """Saved session for ``user_id``, including writes still queued, or None.
+
+        Queued writes are read from memory rather than flushed first. This
+        still reads SQLite, so async callers should run it in a thread.
+        """
+        with self._db_lock:
+            # Holding the db lock keeps a flush from moving queued writes
+            # to disk between the two reads
+            row = self._conn.execute(
+                "SELECT language, practice_mode, state FROM sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            scores = self._conn.execute(
+                "SELECT section, score FROM scores WHERE user_id = ? ORDER BY id", (user_id,)
+            ).fetchall()
+            with self._lock:
+                pending = self._pending_sessions.get(user_id)
+                scores += [(section, score) for uid, section, score, _ in self._pending_scores if uid == user_id]
+        if pending is not None:
+            row = pending[:3]
+        if row is None and not scores:
+            return None
+
+        score_history: Dict[str, List[float]] = {}
+        for section, score in scores:
+            score_history.setdefault(section, []).append(score)
+        language, practice_mode, state = row if row else (None, None, "{}")
+        return {
+            "language": language,
+            "practice_mode": practice_mode,
+            "state": json.loads(state),
+            "score_history": score_history,
+        }
+
+    def flush(self):
+        """Write everything queued in a single transaction.
+
+        If the write fails the batch is put back on the queue and the error
+        is raised, so nothing is lost and the next flush retries it.
+        """
+        with self._db_lock:
+            if self._conn is None:
+                return
+            with self._lock:
+                sessions, self._pending_sessions = self._pending_sessions, {}
+                scores, self._pending_scores = self._pending_scores, []
+                practice, self._pending_practice = self._pending_practice, []
+            if not sessions and not scores and not practice:
+                return
+
+            started = time.monotonic()
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                        [(user_id,) + values for user_id, values in sessions.items()]
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO scores (user_id, section, score, created_at) VALUES (?, ?, ?, ?)",
+                        scores
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO practice_log (session_id, answered_at, section, question_type, score, "
+                        "user_answer, correct_answer) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        practice
+                    )
+            except sqlite3.Error:
+                with self._lock:
+                    # Saves queued meanwhile are newer than the failed batch
+                    sessions.update(self._pending_sessions)
+                    self._pending_sessions = sessions
+                    self._pending_scores = scores + self._pending_scores
+                    self._pending_practice = practice + self._pending_practice
+                raise
+        self.flushes += 1
+        self.written_sessions += len(sessions)
+        self.written_scores += len(scores)
+        self.written_practice += len(practice)
+        self.last_flush_latency = time.monotonic() - started
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._writer.join()
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error("Session flush failed on close, %d writes lost: %s", self.pending(), e)
+        with self._db_lock:
+            self._conn.close()
+            self._conn = None
+
+    def pending(self) -> int:
+        return len(self._pending_sessions) + len(self._pending_scores) + len(self._pending_practice)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": self.pending(),
+            "flushes": self.flushes,
+            "written_sessions": self.written_sessions,
+            "written_scores": self.written_scores,
+            "written_practice": self.written_practice,
+            "last_flush_latency": self.last_flush_latency,
+        }
+
+    def _notify_if_full(self):
+        # Called with the lock held
+        if self.pending() >= self.flush_batch:
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._closed and self.pending() < self.flush_batch:
+                    self._wakeup.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.warning("Session flush failed, will retry: %s", e)
+                time.sleep(self.flush_interval)
@@ -5,7 +5,17 @@ import pandas as pd
 from datetime import datetime, timedelta
 import json
 import os
+import atexit
+import uuid
 from ielts_core import IELTSAIModel, IELTSQuestion
+from sampler import QuestionSampler
+from adaptive import AbilityEstimate
+from progress import PracticeHistory, ScoreHistory, summarize
+from session_store import SessionStore
+from prefetch import Prefetcher
+from concurrent.futures import ThreadPoolExecutor
+import cohort_analytics
+from trends import ScoreTrend, TREND_WINDOW
 
 # Page configuration
 st.set_page_config(
@@ -15,14 +25,54 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
-if 'ielts_model' not in st.session_state:
+@st.cache_resource
+def load_ielts_model():
+    """One model per server process, shared by every browser session.
+    
+    The question store, translation cache, HTTP pool and question pool are
+    all thread-safe, so sessions share them and warm them up for each other.
+    Per-user state (scores, sampler, abilities) stays in session state.
+    """
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
     GOOGLE_TRANSLATE_API_KEY = os.getenv('GOOGLE_TRANSLATE_API_KEY', '')
-    st.session_state.ielts_model = IELTSAIModel(OPENAI_API_KEY, GOOGLE_TRANSLATE_API_KEY)
+    model = IELTSAIModel(OPENAI_API_KEY, GOOGLE_TRANSLATE_API_KEY)
+    model.preload_pyq_translations()
+    QUESTION_POOL_DEPTH = int(os.getenv('IELTS_QUESTION_POOL_DEPTH', '0'))
+    if QUESTION_POOL_DEPTH:
+        model.enable_question_pool(target_depth=QUESTION_POOL_DEPTH)
+    atexit.register(model.close)
+    return model
+
+@st.cache_resource
+def load_session_store():
+    """Process-wide store that older practice-history entries are archived to"""
+    store = SessionStore()
+    atexit.register(store.close)
+    return store
+
+@st.cache_resource
+def load_prefetch_executor():
+    """Threads that build each session's next practice question ahead of time"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="question-prefetch")
+
+# The class-wide report is for teachers' deployments only
+SHOW_COHORT_ANALYTICS = os.getenv('IELTS_COHORT_ANALYTICS', '') == '1'
 
+@st.cache_data(max_entries=4, show_spinner="Building class report...")
+def load_cohort_report(path, modified):
+    """Cohort report for the session database, rebuilt only when ``modified`` changes"""
+    return cohort_analytics.cohort_report(cohort_analytics.load_scores(path))
+
+def session_db_modified(path):
+    """Latest modification time of the database, counting its WAL file"""
+    return max((os.path.getmtime(p) for p in (path, path + "-wal") if os.path.exists(p)), default=0.0)
+
+ielts_model = load_ielts_model()
+session_store = load_session_store()
+
+# Initialize session state
 if 'user_scores' not in st.session_state:
-    st.session_state.user_scores = {"listening": [], "reading": [], "writing": [], "speaking": []}
+    st.session_state.user_scores = {section: ScoreHistory() for section in ["listening", "reading", "writing", "speaking"]}
 
 if 'current_question' not in st.session_state:
     st.session_state.current_question = None
@@ -30,8 +80,139 @@ if 'current_question' not in st.session_state:
 if 'language' not in st.session_state:
     st.session_state.language = 'english'
 
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
 if 'practice_history' not in st.session_state:
-    st.session_state.practice_history = []
+    # Recent entries stay in memory; older ones are archived to the session store
+    session_id = st.session_state.session_id
+    st.session_state.practice_history = PracticeHistory(
+        archive=lambda entry: session_store.archive_practice(session_id, entry)
+    )
+
+if 'sampler' not in st.session_state:
+    st.session_state.sampler = QuestionSampler()
+
+if 'prefetcher' not in st.session_state:
+    st.session_state.prefetcher = Prefetcher(load_prefetch_executor())
+
+if 'abilities' not in st.session_state:
+    st.session_state.abilities = {section: AbilityEstimate() for section in st.session_state.user_scores}
+
+if 'trends' not in st.session_state:
+    st.session_state.trends = {section: ScoreTrend() for section in st.session_state.user_scores}
+
+# Bumped on every recorded answer; derived dashboard data is keyed on it
+if 'score_version' not in st.session_state:
+    st.session_state.score_version = 0
+
+if 'derived' not in st.session_state:
+    st.session_state.derived = {}
+
+def record_answer(section_key, question, feedback, user_answer):
+    """Store a practice answer and invalidate the derived dashboard data"""
+    now = datetime.now()
+    if section_key in st.session_state.user_scores:
+        st.session_state.user_scores[section_key].append(feedback["score"])
+        st.session_state.trends[section_key].add(feedback["score"], now)
+        ielts_model.update_ability(section_key, st.session_state.abilities[section_key], question, feedback["score"])
+    
+    st.session_state.practice_history.append({
+        'date': now,
+        'section': section_key.title(),
+        'question_type': question.question_type,
+        'score': feedback["score"],
+        'user_answer': user_answer,
+        'correct_answer': feedback["correct_answer"]
+    })
+    st.session_state.score_version += 1
+
+def memoized(name, build):
+    """Result of ``build()``, reused across reruns until the next recorded answer"""
+    derived = st.session_state.derived
+    if derived.get('version') != st.session_state.score_version:
+        derived.clear()
+        derived['version'] = st.session_state.score_version
+    if name not in derived:
+        derived[name] = build()
+    return derived[name]
+
+def build_dashboard():
+    summary = summarize(st.session_state.user_scores)
+    data = {
+        'total_questions': summary["total_questions"],
+        'avg_accuracy': summary["accuracy"] * 100,
+        # Same half-rounded mean of section bands as the Progress page
+        'predicted_band': ielts_model.get_band_score_prediction(st.session_state.user_scores)["overall_band"]
+                          if summary["total_questions"] else 0,
+        'practice_days': st.session_state.practice_history.practice_days,
+        'section_figures': None,
+    }
+    
+    section_data = []
+    for section, scores in st.session_state.user_scores.items():
+        if scores:
+            section_data.append({
+                'Section': section.title(),
+                'Average Score': scores.mean() * 100,
+                'Questions Attempted': len(scores)
+            })
+    
+    if section_data:
+        df = pd.DataFrame(section_data)
+        bar = px.bar(df, x='Section', y='Average Score', 
+                   title='Average Scores by Section',
+                   color='Average Score',
+                   color_continuous_scale='RdYlGn')
+        pie = px.pie(df, values='Questions Attempted', names='Section',
+                   title='Practice Distribution by Section')
+        data['section_figures'] = (bar, pie)
+    return data
+
+def build_trend_figure(section, view):
+    """Score trend chart with a bounded number of points, however long the history"""
+    trend = st.session_state.trends[section]
+    if view == "Per day":
+        days, accuracy, attempts = trend.daily_series()
+        df = pd.DataFrame({'Date': days, 'Accuracy': accuracy, 'Attempts': attempts})
+        fig = px.line(df, x='Date', y='Accuracy', hover_data=['Attempts'],
+                    title=f'{section.title()} Daily Accuracy',
+                    markers=len(df) <= 60)
+    else:
+        attempt, accuracy = trend.rolling_series()
+        df = pd.DataFrame({'Question': attempt, 'Accuracy': accuracy})
+        fig = px.line(df, x='Question', y='Accuracy', 
+                    title=f'{section.title()} Score Trend (last {TREND_WINDOW} questions)',
+                    markers=len(df) <= 60)
+    fig.add_hline(y=70, line_dash="dash", line_color="green", 
+                annotation_text="Target: 70%")
+    return fig
+
+def build_progress():
+    summary = summarize(st.session_state.user_scores)
+    sections = {}
+    for section, scores in st.session_state.user_scores.items():
+        if scores:
+            sections[section] = {'count': len(scores), 'avg_score': scores.mean() * 100}
+    
+    recent_history = st.session_state.practice_history.recent(10)
+    history_df = pd.DataFrame([
+        {
+            'Date': item['date'].strftime('%Y-%m-%d %H:%M'),
+            'Section': item['section'],
+            'Question Type': item['question_type'],
+            'Score': '✅' if item['score'] == 1 else '❌'
+        }
+        for item in recent_history
+    ])
+    
+    return {
+        'total_questions': summary["total_questions"],
+        'avg_accuracy': summary["accuracy"] * 100,
+        'prediction': ielts_model.get_band_score_prediction(st.session_state.user_scores),
+        'sections': sections,
+        'history_df': history_df,
+    }
 
 # Custom CSS
 st.markdown("""
@@ -118,6 +299,7 @@ with st.sidebar:
         ["🏠 Dashboard", "📝 Practice", "📚 Previous Year Questions", 
          "🤖 AI Generator", "📊 Progress Tracking", "📅 Study Plan", 
          "📖 Vocabulary Builder", "🔄 Translator"]
+        + (["👥 Cohort Analytics"] if SHOW_COHORT_ANALYTICS else [])
     )
 
 # Dashboard Page
@@ -126,63 +308,32 @@ if page == "🏠 Dashboard":
     
     col1, col2, col3, col4 = st.columns(4)
     
-    # Calculate metrics
-    total_questions = sum(len(scores) for scores in st.session_state.user_scores.values())
-    
-    if total_questions > 0:
-        all_scores = []
-        for scores in st.session_state.user_scores.values():
-            all_scores.extend(scores)
-        avg_accuracy = sum(all_scores) / len(all_scores) * 100
-        predicted_band = min(9.0, max(1.0, (avg_accuracy / 100) * 9))
-    else:
-        avg_accuracy = 0
-        predicted_band = 0
+    # Metrics and charts are only rebuilt after a new answer
+    dashboard = memoized('dashboard', build_dashboard)
     
     with col1:
-        st.metric("Total Questions", total_questions)
+        st.metric("Total Questions", dashboard['total_questions'])
     
     with col2:
-        st.metric("Average Accuracy", f"{avg_accuracy:.1f}%")
+        st.metric("Average Accuracy", f"{dashboard['avg_accuracy']:.1f}%")
     
     with col3:
-        st.metric("Predicted Band", f"{predicted_band:.1f}")
+        st.metric("Predicted Band", f"{dashboard['predicted_band']:.1f}")
     
     with col4:
-        practice_days = len(set(item['date'].date() for item in st.session_state.practice_history))
-        st.metric("Practice Days", practice_days)
+        st.metric("Practice Days", dashboard['practice_days'])
     
     # Progress charts
-    if total_questions > 0:
+    if dashboard['section_figures']:
         st.subheader("Section-wise Performance")
         
-        # Create DataFrame for visualization
-        section_data = []
-        for section, scores in st.session_state.user_scores.items():
-            if scores:
-                avg_score = sum(scores) / len(scores) * 100
-                section_data.append({
-                    'Section': section.title(),
-                    'Average Score': avg_score,
-                    'Questions Attempted': len(scores)
-                })
-        
-        if section_data:
-            df = pd.DataFrame(section_data)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig = px.bar(df, x='Section', y='Average Score', 
-                           title='Average Scores by Section',
-                           color='Average Score',
-                           color_continuous_scale='RdYlGn')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                fig = px.pie(df, values='Questions Attempted', names='Section',
-                           title='Practice Distribution by Section')
-                st.plotly_chart(fig, use_container_width=True)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(dashboard['section_figures'][0], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(dashboard['section_figures'][1], use_container_width=True)
     
     # Quick actions
     st.subheader("Quick Actions")
@@ -218,16 +369,49 @@ elif page == "📝 Practice":
     with col2:
         difficulty = st.selectbox(
             "Difficulty",
-            ["Easy", "Medium", "Hard"]
+            ["Easy", "Medium", "Hard", "Adaptive"]
         )
     
+    arabic = st.session_state.language == 'arabic'
+    prefetch_key = (section.lower(), difficulty, arabic)
+    prefetcher = st.session_state.prefetcher
+    # A question prefetched for another section, difficulty or language is useless now
+    prefetcher.retarget(prefetch_key)
+    
+    sampler = st.session_state.sampler
+    
+    def build_practice_question(sampler, section_key=section.lower(), level=difficulty, arabic=arabic,
+                                abilities=st.session_state.abilities):
+        """Pick (and translate) a question; runs on a prefetch thread, so no st.* calls"""
+        if level == "Adaptive":
+            question = ielts_model.get_adaptive_question(section_key, abilities[section_key], sampler=sampler)
+        else:
+            question = ielts_model.get_pyq_question(section_key, difficulty=level.lower(), sampler=sampler)
+        if arabic:
+            ielts_model.ensure_arabic_translation(question)
+        return question
+    
+    def prefetch_practice_question():
+        """Build the next question on a fork of the sampler, committed only if it is shown"""
+        fork = sampler.fork()
+        prefetcher.prefetch(prefetch_key, lambda: (build_practice_question(fork), fork))
+    
+    def next_practice_question():
+        """Hand over the prefetched question and start building the one after it"""
+        question, fork = prefetcher.take(prefetch_key, lambda: (build_practice_question(sampler), None))
+        if fork is not None:
+            sampler.commit(fork)
+        prefetch_practice_question()
+        return question
+    
     if st.button("Get New Question", type="primary"):
-        question = st.session_state.ielts_model.get_pyq_question(section.lower())
-        st.session_state.current_question = question
+        st.session_state.current_question = next_practice_question()
     
     # Display current question
     if st.session_state.current_question:
         question = st.session_state.current_question
+        # Build the next question while this one is being answered
+        prefetch_practice_question()
         
         st.markdown(f"""
         <div class="question-card">
@@ -239,7 +423,7 @@ elif page == "📝 Practice":
         """, unsafe_allow_html=True)
         
         # Show Arabic translation if available and language is set to Arabic
-        if st.session_state.language == 'arabic' and question.arabic_translation:
+        if st.session_state.language == 'arabic' and ielts_model.ensure_arabic_translation(question):
             st.markdown(f"""
             <div class="arabic-text">
                 <strong>الترجمة العربية:</strong><br>
@@ -261,22 +445,14 @@ elif page == "📝 Practice":
         with col1:
             if st.button("Submit Answer", type="primary"):
                 if user_answer.strip():
-                    feedback = st.session_state.ielts_model.evaluate_answer(question, user_answer)
+                    feedback = ielts_model.evaluate_answer(question, user_answer)
                     
-                    # Store score
-                    section_key = section.lower()
-                    if section_key in st.session_state.user_scores:
-                        st.session_state.user_scores[section_key].append(feedback["score"])
-                    
-                    # Store practice history
-                    st.session_state.practice_history.append({
-                        'date': datetime.now(),
-                        'section': section,
-                        'question_type': question.question_type,
-                        'score': feedback["score"],
-                        'user_answer': user_answer,
-                        'correct_answer': feedback["correct_answer"]
-                    })
+                    # Store score and practice history
+                    record_answer(section.lower(), question, feedback, user_answer)
+                    if difficulty == "Adaptive":
+                        # Re-pick the next question with the updated ability
+                        prefetcher.cancel()
+                        prefetch_practice_question()
                     
                     # Show feedback
                     if feedback["is_correct"]:
@@ -301,8 +477,7 @@ elif page == "📝 Practice":
         
         with col2:
             if st.button("Skip Question"):
-                new_question = st.session_state.ielts_model.get_pyq_question(section.lower())
-                st.session_state.current_question = new_question
+                st.session_state.current_question = next_practice_question()
                 st.rerun()
 
 # Previous Year Questions Page
@@ -315,12 +490,12 @@ elif page == "📚 Previous Year Questions":
         section = st.selectbox("Select Section", ["Listening", "Reading", "Writing", "Speaking"])
     
     with col2:
-        question_types = st.session_state.ielts_model.syllabus[section.lower()]["question_types"]
+        question_types = ielts_model.syllabus_question_types(section.lower())
         question_type = st.selectbox("Question Type (Optional)", ["All Types"] + question_types)
     
     if st.button("Get PYQ", type="primary"):
         qtype = None if question_type == "All Types" else question_type
-        question = st.session_state.ielts_model.get_pyq_question(section.lower(), qtype)
+        question = ielts_model.get_pyq_question(section.lower(), qtype, sampler=st.session_state.sampler)
         st.session_state.current_question = question
     
     # Display PYQ
@@ -331,7 +506,7 @@ elif page == "📚 Previous Year Questions":
         
         st.markdown(f"### Question:\n{question.question}")
         
-        if st.session_state.language == 'arabic' and question.arabic_translation:
+        if st.session_state.language == 'arabic' and ielts_model.ensure_arabic_translation(question):
             st.markdown(f"""
             <div class="arabic-text">
                 <strong>السؤال بالعربية:</strong><br>
@@ -361,25 +536,36 @@ elif page == "🤖 AI Generator":
         section = st.selectbox("Section", ["Listening", "Reading", "Writing", "Speaking"])
     
     with col2:
-        question_types = st.session_state.ielts_model.syllabus[section.lower()]["question_types"]
+        question_types = ielts_model.syllabus_question_types(section.lower())
         question_type = st.selectbox("Question Type", question_types)
     
     with col3:
         difficulty = st.selectbox("Difficulty Level", ["Easy", "Medium", "Hard"])
     
     if st.button("🎯 Generate AI Question", type="primary"):
-        with st.spinner("Generating question with AI..."):
-            try:
-                question = st.session_state.ielts_model.generate_question_with_ai(
-                    section.lower(), question_type, difficulty.lower()
-                )
-                st.session_state.current_question = question
-                st.success("AI question generated successfully!")
-            except Exception as e:
-                st.error(f"Error generating AI question: {str(e)}")
-                st.info("Falling back to previous year question...")
-                question = st.session_state.ielts_model.get_pyq_question(section.lower())
-                st.session_state.current_question = question
+        # Render the question as it streams in instead of waiting for the whole completion
+        preview = st.empty()
+        try:
+            question = None
+            for question in ielts_model.stream_question_with_ai(
+                section.lower(), question_type, difficulty.lower()
+            ):
+                with preview.container():
+                    st.markdown(f"### {question.question}")
+                    for option in question.options or []:
+                        st.write(option)
+                    st.caption("✍️ Generating...")
+            preview.empty()
+            st.session_state.current_question = question
+            st.success("AI question generated successfully!")
+        except Exception as e:
+            preview.empty()
+            st.error(f"Error generating AI question: {str(e)}")
+            st.info("Falling back to previous year question...")
+            question = ielts_model.get_pyq_question(
+                section.lower(), difficulty=difficulty.lower(), sampler=st.session_state.sampler
+            )
+            st.session_state.current_question = question
     
     # Display generated question
     if st.session_state.current_question:
@@ -394,7 +580,7 @@ elif page == "🤖 AI Generator":
         </div>
         """, unsafe_allow_html=True)
         
-        if st.session_state.language == 'arabic' and question.arabic_translation:
+        if st.session_state.language == 'arabic' and ielts_model.ensure_arabic_translation(question):
             st.markdown(f"""
             <div class="arabic-text">
                 {question.arabic_translation}
@@ -410,7 +596,7 @@ elif page == "🤖 AI Generator":
         user_answer = st.text_area("Your Answer:")
         
         if st.button("Check Answer") and user_answer.strip():
-            feedback = st.session_state.ielts_model.evaluate_answer(question, user_answer)
+            feedback = ielts_model.evaluate_answer(question, user_answer)
             
             if feedback["is_correct"]:
                 st.success(f"✅ Correct! {feedback.get('explanation', '')}")
@@ -429,45 +615,31 @@ elif page == "📊 Progress Tracking":
         # Overall statistics
         st.subheader("Overall Statistics")
         
-        total_questions = sum(len(scores) for scores in st.session_state.user_scores.values())
-        all_scores = []
-        for scores in st.session_state.user_scores.values():
-            all_scores.extend(scores)
+        progress = memoized('progress', build_progress)
+        predicted_band = progress['prediction']
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Questions Attempted", total_questions)
+            st.metric("Total Questions Attempted", progress['total_questions'])
         
         with col2:
-            avg_accuracy = (sum(all_scores) / len(all_scores)) * 100 if all_scores else 0
-            st.metric("Overall Accuracy", f"{avg_accuracy:.1f}%")
+            st.metric("Overall Accuracy", f"{progress['avg_accuracy']:.1f}%")
         
         with col3:
-            predicted_band = st.session_state.ielts_model.get_band_score_prediction(st.session_state.user_scores)
             st.metric("Predicted IELTS Band", f"{predicted_band['overall_band']}")
         
         # Section-wise progress
         st.subheader("Section-wise Performance")
+        trend_view = st.radio("Trend", ["Rolling", "Per day"], horizontal=True)
         
-        for section, scores in st.session_state.user_scores.items():
-            if scores:
-                with st.expander(f"{section.title()} - {len(scores)} questions"):
-                    avg_score = (sum(scores) / len(scores)) * 100
-                    st.metric(f"Average Score", f"{avg_score:.1f}%")
-                    
-                    # Score trend
-                    df = pd.DataFrame({
-                        'Question': range(1, len(scores) + 1),
-                        'Score': [s * 100 for s in scores]
-                    })
-                    
-                    fig = px.line(df, x='Question', y='Score', 
-                                title=f'{section.title()} Score Trend',
-                                markers=True)
-                    fig.add_hline(y=70, line_dash="dash", line_color="green", 
-                                annotation_text="Target: 70%")
-                    st.plotly_chart(fig, use_container_width=True)
+        for section, section_progress in progress['sections'].items():
+            with st.expander(f"{section.title()} - {section_progress['count']} questions"):
+                st.metric(f"Average Score", f"{section_progress['avg_score']:.1f}%")
+                
+                # Score trend
+                figure = memoized(('trend', section, trend_view), lambda: build_trend_figure(section, trend_view))
+                st.plotly_chart(figure, use_container_width=True)
         
         # Band score prediction details
         if predicted_band['improvement_areas'] or predicted_band['strengths']:
@@ -490,21 +662,7 @@ elif page == "📊 Progress Tracking":
         # Recent practice history
         if st.session_state.practice_history:
             st.subheader("Recent Practice History")
-            
-            recent_history = sorted(st.session_state.practice_history, 
-                                  key=lambda x: x['date'], reverse=True)[:10]
-            
-            history_df = pd.DataFrame([
-                {
-                    'Date': item['date'].strftime('%Y-%m-%d %H:%M'),
-                    'Section': item['section'],
-                    'Question Type': item['question_type'],
-                    'Score': '✅' if item['score'] == 1 else '❌'
-                }
-                for item in recent_history
-            ])
-            
-            st.dataframe(history_df, use_container_width=True)
+            st.dataframe(progress['history_df'], use_container_width=True)
 
 # Study Plan Page
 elif page == "📅 Study Plan":
@@ -520,19 +678,17 @@ elif page == "📅 Study Plan":
     
     if st.button("Generate Study Plan", type="primary"):
         # Determine current level
-        total_scores = []
-        for scores in st.session_state.user_scores.values():
-            total_scores.extend(scores)
+        summary = summarize(st.session_state.user_scores)
         
         current_level = "intermediate"
-        if total_scores:
-            avg = sum(total_scores) / len(total_scores)
+        if summary["total_questions"]:
+            avg = summary["accuracy"]
             if avg < 0.5:
                 current_level = "beginner"
             elif avg > 0.75:
                 current_level = "advanced"
         
-        study_plan = st.session_state.ielts_model.get_study_plan(
+        study_plan = ielts_model.get_study_plan(
             target_band, current_level, study_weeks
         )
         
@@ -581,10 +737,16 @@ elif page == "📖 Vocabulary Builder":
         ["Beginner", "Intermediate", "Advanced"]
     )
     
-    vocab_data = st.session_state.ielts_model.get_vocabulary_builder(level.lower())
+    vocab_data = ielts_model.get_vocabulary_builder(level.lower())
     
     st.subheader(f"{level} Level Vocabulary")
     
+    # Translate the whole list in one batched request instead of one per word
+    translations = {}
+    if st.session_state.language == 'arabic':
+        all_words = [word for words in vocab_data['vocabulary_list'].values() for word in words]
+        translations = dict(zip(all_words, ielts_model.translate_many(all_words)))
+    
     for category, words in vocab_data['vocabulary_list'].items():
         with st.expander(f"{category.title()} Words"):
             
@@ -598,8 +760,7 @@ elif page == "📖 Vocabulary Builder":
                 with col2:
                     # Get translation if Arabic mode
                     if st.session_state.language == 'arabic':
-                        translation = st.session_state.ielts_model.translate_to_arabic(word)
-                        st.markdown(f"*{translation}*")
+                        st.markdown(f"*{translations[word]}*")
                     
                     # Add example sentence button
                     if st.button(f"Example for '{word}'", key=f"example_{word}"):
@@ -632,7 +793,7 @@ elif page == "🔄 Translator":
         english_text = st.text_area("Enter English text:", height=150)
         
         if st.button("Translate to Arabic") and english_text:
-            arabic_translation = st.session_state.ielts_model.translate_to_arabic(english_text)
+            arabic_translation = ielts_model.translate_to_arabic(english_text)
             st.markdown(f"""
             <div class="arabic-text">
                 {arabic_translation}
@@ -659,6 +820,55 @@ elif page == "🔄 Translator":
         for english, arabic in terms.items():
             st.markdown(f"**{english}** - {arabic}")
 
+# Cohort Analytics Page
+elif page == "👥 Cohort Analytics":
+    st.header("Cohort Analytics / تحليلات المجموعة")
+    st.caption("Class-wide results for every student who practised with the Discord bot")
+    
+    scores_db = cohort_analytics.DEFAULT_SESSION_DB_PATH
+    report = load_cohort_report(scores_db, session_db_modified(scores_db))
+    
+    if not report["students"]:
+        st.info("No recorded answers yet.")
+    else:
+        predictions = report["predictions"]
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Students", report["students"])
+        
+        with col2:
+            st.metric("Median Predicted Band", f"{report['percentiles'].loc['p50', 'overall_band']:.1f}")
+        
+        with col3:
+            st.metric("Answers Recorded", int(predictions["attempts"].sum()))
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            distribution = report["distribution"].rename_axis("Band").reset_index(name="Students")
+            fig = px.bar(distribution, x="Band", y="Students", title="Predicted Overall Band Distribution")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            sections = report["sections"].rename_axis("Section").reset_index()
+            fig = px.bar(sections, x="Section", y="weakest_for",
+                       title="Students Whose Weakest Section Is...",
+                       labels={"weakest_for": "Students"})
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.subheader("Band Percentiles")
+        st.dataframe(report["percentiles"], use_container_width=True)
+        
+        st.subheader("Week over Week")
+        weekly = report["weekly"]
+        fig = px.line(weekly, x="week", y="accuracy", color="section", markers=True,
+                    title="Average Accuracy per Week")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.subheader("Section Breakdown")
+        st.dataframe(report["sections"], use_container_width=True)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def fail():
+    raise RuntimeError("upstream down")
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("test", failure_threshold=2, recovery_timeout=0.05)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+def test_opens_after_consecutive_failures(breaker):
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+    open_breaker(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_success_closes(breaker):
+    open_breaker(breaker)
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert [(old, new) for _, old, new in breaker.transitions] == [
+        (CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)
+    ]
+
+
+def test_half_open_probe_failure_reopens(breaker):
+    open_breaker(breaker)
+    time.sleep(0.06)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+def test_cancelled_probe_releases_its_slot(breaker):
+    open_breaker(breaker)
+    time.sleep(0.06)
+
+    async def probe_then_cancel():
+        task = asyncio.ensure_future(breaker.acall(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(probe_then_cancel())
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_listeners_may_read_the_breaker(breaker):
+    seen = []
+    breaker.listeners.append(lambda name, old, new: seen.append((old, new, breaker.state, breaker.stats()["failures"])))
+    open_breaker(breaker)
+    assert seen == [(CLOSED, OPEN, OPEN, 2)]
@@ -0,0 +1,48 @@
+import pytest
+
+from partial_json import parse_partial_json
+
+
+def test_complete_document_ignores_trailing_fence():
+    assert parse_partial_json('```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+
+
+def test_nothing_decodable_yet():
+    assert parse_partial_json("") is None
+    assert parse_partial_json("```json\n") is None
+
+
+def test_open_string_is_closed_as_it_stands():
+    assert parse_partial_json('{"question": "Which of the') == {"question": "Which of the"}
+
+
+def test_open_array_keeps_finished_items():
+    assert parse_partial_json('{"options": ["A) one", "B) tw') == {"options": ["A) one", "B) tw"]}
+
+
+@pytest.mark.parametrize("text", [
+    '{"question": "Q", "opt',
+    '{"question": "Q", "options"',
+    '{"question": "Q",',
+])
+def test_half_written_key_is_cut_back(text):
+    assert parse_partial_json(text) == {"question": "Q"}
+
+
+@pytest.mark.parametrize("text", ['{"question": "Q", "options":', '{"question": "Q", "options": '])
+def test_key_without_value_yet_is_null(text):
+    assert parse_partial_json(text) == {"question": "Q", "options": None}
+
+
+def test_half_written_literal_is_cut_back():
+    assert parse_partial_json('{"question": "Q", "done": tr') == {"question": "Q"}
+
+
+def test_trailing_backslash_in_string_is_dropped():
+    assert parse_partial_json('{"question": "say \\') == {"question": "say "}
+
+
+def test_escapes_inside_strings_do_not_confuse_the_scan():
+    assert parse_partial_json('{"question": "a \\"quoted\\" {word}, [x]", "b": [1') == {
+        "question": 'a "quoted" {word}, [x]', "b": [1]
+    }
@@ -0,0 +1,76 @@
+import pytest
+
+from question_bank import PYQ_DATABASE, MmapQuestionStore, QuestionBank, SQLiteQuestionStore, write_bank_file
+
+RECORDS = [
+    {"section": "reading", "type": "True/False/Not Given", "difficulty": "hard", "question": "Q1",
+     "answer": "True", "passage": "Some passage — with non-ASCII text: عربي", "options": None, "explanation": None},
+    {"section": "listening", "type": "Multiple Choice", "difficulty": "easy", "question": "Q2",
+     "options": ["A) 6:00 PM", "B) 8:00 PM"], "answer": "B", "explanation": "Said twice.", "passage": None},
+    {"section": "reading", "type": "Multiple Choice", "difficulty": "medium", "question": "Q3",
+     "options": [], "answer": "", "explanation": None, "passage": None},
+    {"section": "writing", "type": "Task 2", "difficulty": "medium", "question": "Q4",
+     "options": None, "answer": None, "explanation": None, "passage": None},
+]
+
+
+def without_id(record):
+    return {key: value for key, value in record.items() if key != "id"}
+
+
+def normalized(record):
+    # The bank file stores empty strings as None
+    return {key: value if value != "" else None for key, value in record.items()}
+
+
+@pytest.fixture
+def bank(tmp_path):
+    path = str(tmp_path / "questions.bank")
+    assert write_bank_file(RECORDS, path) == len(RECORDS)
+    store = MmapQuestionStore(path)
+    yield store
+    store.close()
+
+
+def test_bank_file_round_trips_every_record(bank):
+    assert len(bank) == len(RECORDS)
+    stored = [without_id(bank.get(question_id)) for question_id in range(len(bank))]
+    assert sorted(stored, key=lambda r: r["question"]) == [normalized(record) for record in RECORDS]
+
+
+def test_bank_file_ids_match_filters(bank):
+    assert bank.count("reading") == 2
+    assert bank.count("reading", "Multiple Choice") == 1
+    assert bank.count("reading", None, "hard") == 1
+    assert bank.count("speaking") == 0
+    question_id = bank.id_at("reading", None, "hard", 0)
+    assert bank.get(question_id)["question"] == "Q1"
+    assert sorted(bank.get(bank.id_at("reading", None, None, i))["question"] for i in range(2)) == ["Q1", "Q3"]
+
+
+def test_bank_file_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_bank"
+    path.write_bytes(b"x" * 128)
+    with pytest.raises(ValueError):
+        MmapQuestionStore(str(path))
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: QuestionBank(PYQ_DATABASE),
+    lambda tmp_path: SQLiteQuestionStore(str(tmp_path / "questions.db")),
+])
+def test_stores_export_to_an_equivalent_bank_file(tmp_path, make_store):
+    store = make_store(tmp_path)
+    if isinstance(store, SQLiteQuestionStore):
+        store.seed(PYQ_DATABASE)
+    path = str(tmp_path / "export.bank")
+    write_bank_file(store.iter_records(), path)
+    bank = MmapQuestionStore(path)
+    for section in PYQ_DATABASE:
+        for question_type in {record["type"] for record in PYQ_DATABASE[section]}:
+            assert bank.count(section, question_type) == store.count(section, question_type)
+    assert sorted(record["question"] for record in bank.iter_records()) == sorted(
+        record["question"] for records in PYQ_DATABASE.values() for record in records
+    )
+    bank.close()
+    store.close()
@@ -0,0 +1,45 @@
+import pytest
+
+from sampler import QuestionSampler, permute
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 7, 16, 100, 1000, 4097])
+@pytest.mark.parametrize("seed", [0, 12345, 0xFFFFFFFF])
+def test_permute_is_a_bijection(n, seed):
+    assert sorted(permute(i, n, seed) for i in range(n)) == list(range(n))
+
+
+def test_permute_depends_on_seed():
+    assert [permute(i, 100, 1) for i in range(100)] != [permute(i, 100, 2) for i in range(100)]
+
+
+def test_sampler_does_not_repeat_until_the_pool_is_used_up():
+    sampler = QuestionSampler()
+    first = [sampler.next_position("key", 10) for _ in range(10)]
+    assert sorted(first) == list(range(10))
+    assert sampler.remaining("key", 10) == 0
+    assert sorted(sampler.next_position("key", 10) for _ in range(10)) == list(range(10))
+
+
+def test_sampler_state_round_trips():
+    sampler = QuestionSampler()
+    for _ in range(3):
+        sampler.next_position(("reading", None, "easy"), 10)
+    restored = QuestionSampler.from_list(sampler.to_list())
+    assert [restored.next_position(("reading", None, "easy"), 10) for _ in range(7)] == [
+        sampler.next_position(("reading", None, "easy"), 10) for _ in range(7)
+    ]
+
+
+def test_forked_picks_only_count_once_committed():
+    sampler = QuestionSampler()
+    sampler.next_position("key", 10)
+    discarded = sampler.fork()
+    discarded.next_position("key", 10)
+    assert sampler.remaining("key", 10) == 9
+
+    taken = sampler.fork()
+    position = taken.next_position("key", 10)
+    sampler.commit(taken)
+    assert sampler.remaining("key", 10) == 8
+    assert position not in [sampler.next_position("key", 10) for _ in range(8)]
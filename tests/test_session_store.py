@@ -0,0 +1,113 @@
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from session_store import SessionStore
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def rows(path, table):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "sessions.db")
+
+
+def test_writes_are_queued_then_flushed_after_the_interval(db_path):
+    store = SessionStore(db_path, flush_interval=0.05, flush_batch=1000)
+    store.save(1, "english", "reading", {"a": 1})
+    store.record_score(1, "reading", 1.0)
+    assert store.pending() == 2
+    wait_for(lambda: store.pending() == 0 and store.flushes)
+    assert rows(db_path, "sessions") == 1 and rows(db_path, "scores") == 1
+    store.close()
+
+
+def test_a_full_batch_flushes_before_the_interval(db_path):
+    store = SessionStore(db_path, flush_interval=60, flush_batch=10)
+    for i in range(10):
+        store.record_score(1, "reading", i % 2)
+    wait_for(lambda: store.written_scores == 10)
+    assert store.flushes == 1
+    store.close()
+
+
+def test_repeated_saves_are_coalesced(db_path):
+    store = SessionStore(db_path, flush_interval=60)
+    for language in ("english", "arabic", "english"):
+        store.save(1, language, None, {})
+    assert store.pending() == 1
+    store.flush()
+    assert store.written_sessions == 1
+    assert store.load(1)["language"] == "english"
+    store.close()
+
+
+def test_load_merges_queued_writes_without_flushing(db_path):
+    store = SessionStore(db_path, flush_interval=60)
+    store.save(1, "english", "reading", {"sampler": []})
+    store.record_score(1, "reading", 1.0)
+    store.flush()
+    store.save(1, "arabic", "writing", {"sampler": [[1]]})
+    store.record_score(1, "reading", 0.0)
+    store.record_score(1, "writing", 1.0)
+    store.record_score(2, "reading", 1.0)
+
+    saved = store.load(1)
+    assert store.pending() == 4
+    assert saved == {
+        "language": "arabic",
+        "practice_mode": "writing",
+        "state": {"sampler": [[1]]},
+        "score_history": {"reading": [1.0, 0.0], "writing": [1.0]},
+    }
+    assert store.load(3) is None
+    store.close()
+
+
+def test_failed_flush_requeues_the_batch(db_path):
+    store = SessionStore(db_path, flush_interval=60)
+    store.save(1, "english", None, {})
+    store.record_score(1, "reading", 1.0)
+
+    blocker = sqlite3.connect(db_path, timeout=0)
+    blocker.execute("BEGIN EXCLUSIVE")
+    store._conn.execute("PRAGMA busy_timeout = 0")
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.pending() == 2
+
+    # A save queued after the failure wins over the requeued one
+    store.save(1, "arabic", None, {})
+    blocker.rollback()
+    blocker.close()
+    store.flush()
+    assert store.pending() == 0
+    assert store.load(1)["language"] == "arabic"
+    assert store.load(1)["score_history"] == {"reading": [1.0]}
+    store.close()
+
+
+def test_close_writes_everything_queued(db_path):
+    store = SessionStore(db_path, flush_interval=60)
+    store.archive_practice("session", {
+        "date": datetime(2024, 1, 1), "section": "Reading",
+        "question_type": "Multiple Choice", "score": 1.0,
+    })
+    store.record_score(1, "reading", 1.0)
+    store.close()
+    assert rows(db_path, "scores") == 1 and rows(db_path, "practice_log") == 1
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def run_concurrently(flight, fn, callers=5):
+    results = [None] * callers
+    started = threading.Barrier(callers)
+
+    def call(i):
+        started.wait()
+        try:
+            results[i] = flight.do("key", fn)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_followers_share_the_leaders_result():
+    flight = SingleFlight()
+    runs = []
+
+    def fn():
+        runs.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = run_concurrently(flight, fn)
+    assert len(runs) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 1, "shared": 4, "in_flight": 0}
+
+
+def test_followers_share_the_leaders_exception():
+    flight = SingleFlight()
+    error = RuntimeError("boom")
+
+    def fn():
+        time.sleep(0.1)
+        raise error
+
+    assert all(result is error for result in run_concurrently(flight, fn))
+    assert flight.calls == 1
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+
+
+def test_async_followers_share_the_leaders_result_and_exception():
+    flight = AsyncSingleFlight()
+    runs = []
+
+    async def fn():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return object()
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    async def main():
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+        errors = await asyncio.gather(*(flight.do("other", fail) for _ in range(3)), return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(main())
+    assert len(runs) == 1 and all(result is results[0] for result in results)
+    assert all(isinstance(error, RuntimeError) and error is errors[0] for error in errors)
+    assert flight.stats() == {"calls": 2, "shared": 6, "in_flight": 0}
+
+
+def test_a_cancelled_follower_does_not_cancel_the_call():
+    flight = AsyncSingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("key", fn))
+        follower = asyncio.ensure_future(flight.do("key", fn))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,81 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+
+from cache import TranslationCache
+from circuit_breaker import CircuitBreaker
+from ielts_core import IELTSAIModel
+from question_bank import PYQ_DATABASE, QuestionBank
+
+QUESTION = {
+    "question": "Which of the following is true?",
+    "options": ["A) one", "B) two"],
+    "correct_answer": "B",
+    "explanation": "Because.",
+}
+
+
+def chunks(content, size=7):
+    return [{"choices": [{"delta": {"content": content[i:i + size]}}]} for i in range(0, len(content), size)]
+
+
+async def achunks(content):
+    for chunk in chunks(content):
+        yield chunk
+
+
+@pytest.fixture
+def model():
+    model = IELTSAIModel("test-key", translation_cache=TranslationCache(path=None),
+                         question_store=QuestionBank(PYQ_DATABASE),
+                         openai_breaker=CircuitBreaker("openai", failure_threshold=1, recovery_timeout=60))
+    yield model
+    model.close()
+
+
+def stream(model, content):
+    with mock.patch("openai.ChatCompletion.create", return_value=iter(chunks(content))):
+        return list(model.stream_question_with_ai("reading", "Multiple Choice", "medium"))
+
+
+def test_stream_yields_growing_partials_then_the_complete_question(model):
+    updates = stream(model, "```json\n" + json.dumps(QUESTION) + "\n```")
+    final = updates[-1]
+    assert (final.question, final.options, final.correct_answer, final.explanation) == (
+        QUESTION["question"], QUESTION["options"], QUESTION["correct_answer"], QUESTION["explanation"]
+    )
+    partial_texts = [update.question for update in updates[:-1]]
+    assert len(partial_texts) > 1
+    assert all(QUESTION["question"].startswith(text) for text in partial_texts)
+    assert model.openai_breaker.successes == 1
+
+
+def test_malformed_stream_falls_back_to_a_pyq(model):
+    updates = stream(model, '{"question": "Half a question')
+    final = updates[-1]
+    assert final.question_id is not None
+    assert final.question in [q["question"] for q in PYQ_DATABASE["reading"]]
+    assert updates[-2].question == "Half a question"
+
+
+def test_upstream_error_falls_back_and_opens_the_circuit(model):
+    with mock.patch("openai.ChatCompletion.create", side_effect=RuntimeError("boom")):
+        updates = list(model.stream_question_with_ai("reading", "Multiple Choice", "medium"))
+    assert len(updates) == 1 and updates[0].question_id is not None
+    assert model.openai_breaker.state == "open"
+
+
+def test_async_stream_matches_sync(model):
+    async def run():
+        async def acreate(**kwargs):
+            return achunks(json.dumps(QUESTION))
+        with mock.patch("openai.ChatCompletion.acreate", acreate):
+            updates = [update async for update in model.astream_question_with_ai(
+                "reading", "Multiple Choice", "medium")]
+        await model.aclose()
+        return updates
+    updates = asyncio.run(run())
+    assert updates[-1].question == QUESTION["question"]
+    assert updates[-1].correct_answer == "B"
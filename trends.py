@@ -0,0 +1,101 @@
+from array import array
+from collections import deque
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Attempts averaged into each point of the rolling accuracy line
+TREND_WINDOW = 10
+# Upper bound on points sent to the browser per chart
+MAX_CHART_POINTS = 300
+
+
+def lttb(x, y, threshold: int = MAX_CHART_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets downsampling to at most ``threshold`` points.
+
+    Keeps the first and last point and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the mean of the next bucket, which preserves the visual shape of the line.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    bucket_size = (n - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if end < n - 1:
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        keep[i + 1] = previous
+    return x[keep], y[keep]
+
+
+class ScoreTrend:
+    """Incrementally maintained accuracy trend for one section.
+
+    Each ``add`` is O(1): it updates the rolling accuracy over the last
+    ``window`` attempts (stored as one float per attempt) and the per-day
+    bucket for the answer's date. Chart series are downsampled with LTTB,
+    so their size is capped however long the history grows.
+    """
+
+    __slots__ = ("window", "_recent", "_recent_total", "_rolling", "_days")
+
+    def __init__(self, window: int = TREND_WINDOW):
+        self.window = window
+        self._recent = deque(maxlen=window)
+        self._recent_total = 0.0
+        self._rolling = array("f")
+        # date -> [attempts, total score], in insertion (chronological) order
+        self._days: Dict[date, List] = {}
+
+    def add(self, score: float, when: Optional[datetime] = None):
+        if len(self._recent) == self.window:
+            self._recent_total -= self._recent[0]
+        self._recent.append(score)
+        self._recent_total += score
+        self._rolling.append(self._recent_total / len(self._recent))
+
+        day = (when or datetime.now()).date()
+        bucket = self._days.get(day)
+        if bucket is None:
+            bucket = self._days[day] = [0, 0.0]
+        bucket[0] += 1
+        bucket[1] += score
+
+    def __len__(self) -> int:
+        return len(self._rolling)
+
+    def rolling_series(self, max_points: int = MAX_CHART_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+        """(attempt number, rolling accuracy in %) with at most ``max_points`` points"""
+        y = np.frombuffer(self._rolling, dtype=np.float32).astype(float) * 100
+        x = np.arange(1, len(y) + 1, dtype=float)
+        return lttb(x, y, max_points)
+
+    def daily_series(self, max_points: int = MAX_CHART_POINTS) -> Tuple[List[date], np.ndarray, np.ndarray]:
+        """(day, accuracy in %, attempts) per practice day, downsampled if needed"""
+        days = list(self._days)
+        counts = np.array([bucket[0] for bucket in self._days.values()], dtype=float)
+        accuracy = np.array([bucket[1] for bucket in self._days.values()], dtype=float) / np.maximum(counts, 1) * 100
+        if len(days) > max_points:
+            ordinals = np.array([day.toordinal() for day in days], dtype=float)
+            kept, accuracy = lttb(ordinals, accuracy, max_points)
+            positions = np.searchsorted(ordinals, kept)
+            days = [days[i] for i in positions]
+            counts = counts[positions]
+        return days, accuracy, counts